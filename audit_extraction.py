@@ -1,14 +1,17 @@
-import json
+import numpy as np
+import orjson
 import pandas as pd
+import pyarrow.parquet as pq
 from pathlib import Path
-import statistics
 
 P = Path("schemes_with_rules.parquet")
 if not P.exists():
     print("ERROR: schemes_with_rules.parquet not found. Run extract_eligibility_rules.py first.")
     raise SystemExit(1)
 
-df = pd.read_parquet(P)
+AUDIT_COLUMNS = ["scheme_id", "scheme_name", "eligibility_structured", "eligibility_raw"]
+available = set(pq.read_schema(P).names)
+df = pd.read_parquet(P, columns=[c for c in AUDIT_COLUMNS if c in available])
 n = len(df)
 print(f"Loaded {n} schemes from {P}")
 
@@ -20,57 +23,60 @@ if col not in df.columns:
 has_structured = df[col].notna().sum()
 print(f"Schemes with non-null '{col}': {has_structured} ({has_structured/n:.2%})")
 
-total_required = 0
-total_optional = 0
-schemes_with_any_rule = 0
-confidence_values = []
+def _conf_or_nan(conf):
+    if conf is None:
+        return np.nan
+    try:
+        return float(conf)
+    except Exception:
+        return np.nan
 
 def safe_load(x):
     if x is None:
         return {}
-    if isinstance(x, str):
+    if isinstance(x, (str, bytes)):
         try:
-            return json.loads(x)
-        except Exception:
+            return orjson.loads(x)
+        except orjson.JSONDecodeError:
             return {}
     if isinstance(x, dict):
         return x
     return {}
 
-for _, row in df.iterrows():
-    obj = safe_load(row[col])
-    req = obj.get("required", []) if isinstance(obj, dict) else []
-    opt = obj.get("optional", []) if isinstance(obj, dict) else []
-    if req or opt:
-        schemes_with_any_rule += 1
-    total_required += len(req)
-    total_optional += len(opt)
-    for r in req + opt:
-        conf = r.get("confidence")
-        if conf is not None:
-            try:
-                confidence_values.append(float(conf))
-            except Exception:
-                pass
+parsed = [safe_load(x) for x in df[col].to_numpy()]
+parsed = [obj if isinstance(obj, dict) else {} for obj in parsed]
+req_lists = [obj.get("required") or [] for obj in parsed]
+opt_lists = [obj.get("optional") or [] for obj in parsed]
+
+req_lens = np.fromiter((len(r) for r in req_lists), dtype=np.int32, count=n)
+opt_lens = np.fromiter((len(o) for o in opt_lists), dtype=np.int32, count=n)
+total_required = int(req_lens.sum())
+total_optional = int(opt_lens.sum())
+schemes_with_any_rule = int(((req_lens + opt_lens) > 0).sum())
+
+confs = np.array(
+    [_conf_or_nan(r.get("confidence")) for req, opt in zip(req_lists, opt_lists) for r in req + opt],
+    dtype=np.float64,
+)
+# NaN marks missing or unparseable confidences
+conf_count = int(np.count_nonzero(~np.isnan(confs)))
 
 print(f"Schemes with >=1 extracted clause: {schemes_with_any_rule} ({schemes_with_any_rule/n:.2%})")
 print(f"Total required clauses extracted: {total_required}")
 print(f"Total optional clauses extracted: {total_optional}")
 
-if confidence_values:
+if conf_count:
     print(
-        f"Confidence values: count={len(confidence_values)}, "
-        f"mean={statistics.mean(confidence_values):.3f}, "
-        f"median={statistics.median(confidence_values):.3f}, "
-        f"min={min(confidence_values):.3f}, "
-        f"max={max(confidence_values):.3f}"
+        f"Confidence values: count={conf_count}, "
+        f"mean={np.nansum(confs) / conf_count:.3f}, "
+        f"median={np.nanmedian(confs):.3f}, "
+        f"min={np.nanmin(confs):.3f}, "
+        f"max={np.nanmax(confs):.3f}"
     )
 else:
     print("No confidence values found in clauses (extractor didn't set confidence)")
 
-df["num_clauses"] = df[col].apply(lambda x: (
-    len((safe_load(x) or {}).get("required", [])) + len((safe_load(x) or {}).get("optional", []))
-))
+df["num_clauses"] = req_lens + opt_lens
 top = df.sort_values("num_clauses", ascending=False).head(10)[["scheme_id", "scheme_name", "num_clauses"]]
 print("\nTop 10 schemes by clause count:")
 print(top.to_string(index=False))
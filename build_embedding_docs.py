@@ -1,23 +1,38 @@
-import pandas as pd
 import re
+from collections import namedtuple
+
+import pandas as pd
+import pyarrow.parquet as pq
 
 MAX_EMBED_DOC_LEN = 4000  # max characters for embed_doc
 
+EXPECTED_COLS = [
+    "scheme_name",
+    "description_raw",
+    "benefits_raw",
+    "eligibility_raw",
+    "process_raw",
+    "state_scope",
+    "category",
+    "source_url",
+]
+
+# Attribute access over the plain tuples from itertuples(name=None)
+EmbedRow = namedtuple("EmbedRow", EXPECTED_COLS)
+
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
 
-def clean_text(text):
-    """Clean and normalize text by handling None/NaN and normalizing whitespace."""
-    if pd.isna(text):
-        return ""
-    # Convert to string in case it's not already
-    text = str(text)
-    # Normalize whitespace (collapse multiple spaces/newlines)
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
+def clean_text_column(col: pd.Series) -> pd.Series:
+    """Clean a text column: NaN/None -> "", cast to str, collapse whitespace, strip."""
+    return col.fillna("").astype(str).str.replace(_WHITESPACE_RE, ' ', regex=True).str.strip()
 
 
-def build_single_embed_doc(row: pd.Series) -> str:
+def build_single_embed_doc(row) -> str:
     """
-    Build a single embed_doc string for a given scheme row.
+    Build a single embed_doc string for a given scheme row (a namedtuple from
+    ``itertuples`` or a ``pd.Series``; fields are read as attributes).
 
     Priority:
     1. Always keep scheme_name, Description, and Eligibility.
@@ -25,14 +40,14 @@ def build_single_embed_doc(row: pd.Series) -> str:
     3. Always include State scope, Category, and Source at the end.
     4. Never exceed MAX_EMBED_DOC_LEN characters (hard cap).
     """
-    scheme_name = row["scheme_name"]
-    description = row["description_raw"]
-    benefits = row["benefits_raw"]
-    eligibility = row["eligibility_raw"]
-    process = row["process_raw"]
-    state_scope = row["state_scope"]
-    category = row["category"]
-    source_url = row["source_url"]
+    scheme_name = row.scheme_name
+    description = row.description_raw
+    benefits = row.benefits_raw
+    eligibility = row.eligibility_raw
+    process = row.process_raw
+    state_scope = row.state_scope
+    category = row.category
+    source_url = row.source_url
 
     # Metadata block (always appended at the end)
     meta_block = (
@@ -48,51 +63,42 @@ def build_single_embed_doc(row: pd.Series) -> str:
         f"Eligibility:\n{eligibility}\n\n"
     )
 
-    # Optional sections
-    benefits_block = ""
-    if benefits:
-        benefits_block = f"Benefits:\n{benefits}\n\n"
-
-    process_block = ""
-    if process:
-        process_block = f"Process:\n{process}\n\n"
-
-    # Start assembling the document
-    embed_doc = head
+    # Remaining capacity for optional sections once head and meta_block are
+    # reserved; tracked as a counter so the growing doc is never re-measured.
+    budget = MAX_EMBED_DOC_LEN - len(head) - len(meta_block) - 1
 
     # We will try to add Benefits and Process in order, as long as we don't exceed limit
-    optional_sections = [benefits_block, process_block]
-
-    for section in optional_sections:
-        if not section:
+    middle = []
+    total_len = len(head) + len(meta_block)
+    for label, text in (("Benefits", benefits), ("Process", process)):
+        if not text:
             continue
-
-        # Remaining capacity before we MUST reserve room for meta_block
-        remaining_for_sections = MAX_EMBED_DOC_LEN - len(embed_doc) - len(meta_block) - 1
-        if remaining_for_sections <= 0:
+        if budget <= 0:
             break
 
-        if len(section) <= remaining_for_sections:
+        section = f"{label}:\n{text}\n\n"
+        if len(section) <= budget:
             # We can fit the whole section
-            embed_doc += section
+            middle.append(section)
+            budget -= len(section)
+            total_len += len(section)
         else:
             # We can only fit part of the section
-            truncated_text = section[:remaining_for_sections]
+            truncated_text = section[:budget]
 
             # Avoid cutting a word in the middle if possible
             if " " in truncated_text:
                 truncated_text = truncated_text.rsplit(" ", 1)[0]
 
-            truncated_text += "..."
-            embed_doc += truncated_text + "\n\n"
+            middle.append(truncated_text + "...\n\n")
+            total_len += len(truncated_text) + 5
             # No need to try adding more sections after this; we are basically full
             break
 
-    # Finally, append metadata
-    embed_doc += meta_block
+    embed_doc = head + "".join(middle) + meta_block
 
-    # Final safety: hard truncate if for some reason we still exceed the limit
-    if len(embed_doc) > MAX_EMBED_DOC_LEN:
+    # Final safety: head alone (or the "..." suffix) can still push past the limit
+    if total_len > MAX_EMBED_DOC_LEN:
         safe_trunc = embed_doc[: MAX_EMBED_DOC_LEN - 3]
         if " " in safe_trunc:
             safe_trunc = safe_trunc.rsplit(" ", 1)[0]
@@ -101,35 +107,41 @@ def build_single_embed_doc(row: pd.Series) -> str:
     return embed_doc
 
 
+def assemble_embed_docs(df: pd.DataFrame) -> list:
+    """Build embed_doc for every row of an already-cleaned frame, preserving order."""
+    rows = df[EXPECTED_COLS].itertuples(index=False, name=None)
+    return [build_single_embed_doc(EmbedRow._make(r)) for r in rows]
+
+
 def build_embedding_docs():
     # Load the input parquet file
-    df = pd.read_parquet("schemes_with_rules.parquet")
+    input_path = "schemes_with_rules.parquet"
+    available = set(pq.read_schema(input_path).names)
+    columns = [c for c in ["scheme_id"] + EXPECTED_COLS if c in available]
+    df = pd.read_parquet(input_path, columns=columns)
 
     # Ensure the expected columns exist (basic sanity check)
-    expected_cols = [
-        "scheme_name",
-        "description_raw",
-        "benefits_raw",
-        "eligibility_raw",
-        "process_raw",
-        "state_scope",
-        "category",
-        "source_url",
-    ]
-    missing = [c for c in expected_cols if c not in df.columns]
+    missing = [c for c in EXPECTED_COLS if c not in df.columns]
     if missing:
         raise ValueError(f"Missing expected columns in schemes_with_rules.parquet: {missing}")
 
     # Clean relevant text columns once (vectorized) instead of per-row in the loop
-    for col in expected_cols:
-        df[col] = df[col].apply(clean_text)
+    for col in EXPECTED_COLS:
+        df[col] = clean_text_column(df[col])
 
     # Build embed_doc for each row
-    df["embed_doc"] = df.apply(build_single_embed_doc, axis=1)
+    df["embed_doc"] = assemble_embed_docs(df)
 
     # Save the result
     output_path = "scheme_embed_docs.parquet"
-    df.to_parquet(output_path, index=False)
+    df.to_parquet(
+        output_path,
+        index=False,
+        engine="pyarrow",
+        compression="zstd",
+        compression_level=3,
+        row_group_size=4096,
+    )
     print(f"Successfully saved {len(df)} schemes with embedding documents to '{output_path}'")
 
 
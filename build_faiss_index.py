@@ -10,15 +10,74 @@ import argparse
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def build_faiss_index(embeddings_path: str, ids_path: str, out_path: str):
+INDEX_TYPES = ("flat", "sq8", "sqfp16", "hnsw", "ivfpq")
+ANN_INDEX_TYPES = ("hnsw", "ivfpq")
+# Below this many vectors an exhaustive flat search is already fast and ANN
+# structures (graph build / PQ training) don't pay for themselves.
+ANN_MIN_VECTORS = 10000
+# FAISS wants at least this many training points per k-means centroid
+MIN_POINTS_PER_CENTROID = 39
+# Exhaustive search over scalar-quantized codes (1 or 2 bytes per dimension)
+SQ_TYPES = {
+    "sq8": faiss.ScalarQuantizer.QT_8bit,
+    "sqfp16": faiss.ScalarQuantizer.QT_fp16,
+}
+
+def pq_subquantizers(dim: int) -> int:
+    """Largest PQ sub-quantizer count up to dim / 8 that divides dim (0 if dim < 8)."""
+    return next((m for m in range(dim // 8, 0, -1) if dim % m == 0), 0)
+
+def create_index(index_type: str, embeddings: np.ndarray):
+    """Create and populate an inner-product FAISS index of the requested type."""
+    n, dim = embeddings.shape
+    if index_type in ANN_INDEX_TYPES and n < ANN_MIN_VECTORS:
+        logger.info(f"Only {n} vectors; using flat index instead of {index_type}")
+        index_type = "flat"
+    if index_type == "ivfpq" and not pq_subquantizers(dim):
+        logger.info(f"Dimension {dim} is too small for product quantization; using flat index")
+        index_type = "flat"
+
+    if index_type == "flat":
+        index = faiss.IndexFlatIP(dim)  # Inner product (cosine similarity) index
+    elif index_type in SQ_TYPES:
+        index = faiss.IndexScalarQuantizer(dim, SQ_TYPES[index_type], faiss.METRIC_INNER_PRODUCT)
+        index.train(embeddings)  # learns per-dimension value ranges
+    elif index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, 32, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = 200
+        index.hnsw.efSearch = 128
+    elif index_type == "ivfpq":
+        # Capped so every inverted list gets enough training points
+        nlist = min(int(4 * np.sqrt(n)), n // MIN_POINTS_PER_CENTROID)
+        m = pq_subquantizers(dim)
+        quantizer = faiss.IndexFlatIP(dim)
+        index = faiss.IndexIVFPQ(quantizer, dim, nlist, m, 8, faiss.METRIC_INNER_PRODUCT)
+        index.train(embeddings)
+        index.nprobe = min(nlist, 16)
+    else:
+        raise ValueError(f"Unknown index type '{index_type}'; expected one of {INDEX_TYPES}")
+
+    index.add(embeddings)
+    return index, index_type
+
+def build_faiss_index(embeddings_path: str, ids_path: str, out_path: str, index_type: str = "flat", num_threads: int = None):
     try:
+        if num_threads:
+            faiss.omp_set_num_threads(num_threads)
+
         # Create faiss_index directory if it doesn't exist
         Path(out_path).parent.mkdir(parents=True, exist_ok=True)
         
         # Load embeddings and IDs
         logger.info("Loading embeddings and IDs...")
-        embeddings = np.load(embeddings_path, allow_pickle=True)
-        scheme_ids = np.load(ids_path, allow_pickle=True)
+        # Typed .npy files (float32 / unicode) load without pickle, so the
+        # embeddings can be memory-mapped and paged in as FAISS reads them.
+        embeddings = np.load(embeddings_path, mmap_mode='r')
+        scheme_ids = np.load(ids_path)
+        # FAISS needs a C-contiguous float32 buffer; convert once here rather
+        # than letting each add/train call make its own hidden copy.
+        if embeddings.dtype != np.float32 or not embeddings.flags['C_CONTIGUOUS']:
+            embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
         
         # Verify shapes
         if len(embeddings) != len(scheme_ids):
@@ -29,10 +88,7 @@ def build_faiss_index(embeddings_path: str, ids_path: str, out_path: str):
         
         # Create and build the FAISS index
         logger.info("Building FAISS index...")
-        index = faiss.IndexFlatIP(dim)  # Inner product (cosine similarity) index
-
-        # Add vectors to the index
-        index.add(embeddings)
+        index, index_type = create_index(index_type, embeddings)
 
         # Save the FAISS index to faiss_index directory
         index_file = Path(out_path)
@@ -42,6 +98,7 @@ def build_faiss_index(embeddings_path: str, ids_path: str, out_path: str):
         id_map = {
             'index_to_id': scheme_ids.tolist(),
             'dimension': dim,
+            'index_type': index_type,
             'total_vectors': len(scheme_ids)
         }
         id_map_path = Path(out_path).with_suffix('').parent / (Path(out_path).stem + '_id_map.json')
@@ -51,6 +108,7 @@ def build_faiss_index(embeddings_path: str, ids_path: str, out_path: str):
         logger.info(f"FAISS index saved to {index_file}")
         logger.info(f"Total vectors indexed: {index.ntotal}")
         logger.info(f"Index dimension: {dim}")
+        logger.info(f"Index type: {index_type}")
         
         return True
         
@@ -73,5 +131,7 @@ if __name__ == "__main__":
     parser.add_argument("--embeddings", default="faiss_index/scheme_embeddings.npy")
     parser.add_argument("--ids", default="faiss_index/scheme_ids.npy")
     parser.add_argument("--out", default="faiss_index/faiss_index.bin")
+    parser.add_argument("--index-type", dest="index_type", choices=INDEX_TYPES, default="flat")
+    parser.add_argument("--threads", type=int, default=None, help="FAISS OpenMP threads (default: the OpenMP default, usually all cores)")
     args = parser.parse_args()
-    build_faiss_index(args.embeddings, args.ids, args.out)
+    build_faiss_index(args.embeddings, args.ids, args.out, args.index_type, args.threads)
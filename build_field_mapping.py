@@ -1,10 +1,12 @@
-import json
 import logging
 from collections import Counter
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
-from typing import Dict, Any, Set
+from typing import Dict, Any, List, Set
 
-import pandas as pd
+import orjson
+import pyarrow.parquet as pq
 
 
 logging.basicConfig(
@@ -61,52 +63,52 @@ BASE_FIELD_MAPPING: Dict[str, str] = {
 }
 
 
-def _load_rules(df: pd.DataFrame) -> Dict[str, Any]:
-    """Return a dict-like view of eligibility_structured per row."""
-    if "eligibility_structured" not in df.columns:
+def _read_structured_column(input_file: Path) -> List[Any]:
+    """Read only eligibility_structured from parquet as a plain Python list."""
+    if "eligibility_structured" not in pq.read_schema(input_file).names:
         raise KeyError("Column 'eligibility_structured' not found in input data.")
+    return pq.read_table(input_file, columns=["eligibility_structured"]).column(0).to_pylist()
 
-    parsed_rules = {}
-    for idx, raw in df["eligibility_structured"].items():
+
+def _load_rules(raw_values: List[Any]) -> List[Dict[str, Any]]:
+    """Parse eligibility_structured values, skipping rows that aren't usable."""
+    parsed_rules = []
+    for idx, raw in enumerate(raw_values):
         if isinstance(raw, dict):
-            parsed_rules[idx] = raw
+            parsed_rules.append(raw)
             continue
-        if isinstance(raw, str):
+        if isinstance(raw, (str, bytes)):
             try:
-                parsed_rules[idx] = json.loads(raw)
-            except json.JSONDecodeError:
+                parsed_rules.append(orjson.loads(raw))
+            except orjson.JSONDecodeError:
                 logger.warning("Row %s has invalid JSON in eligibility_structured; skipping.", idx)
         else:
             logger.warning("Row %s has unsupported type for eligibility_structured; skipping.", idx)
     return parsed_rules
 
 
-def _collect_unique_fields(rules_by_row: Dict[int, Any]) -> Counter:
-    fields_counter: Counter = Counter()
-    for rules in rules_by_row.values():
-        for bucket in ("required", "optional"):
-            raw_list = rules.get(bucket, [])
-
-            # Guard against unexpected types (e.g., numpy arrays, None, scalars)
-            if raw_list is None:
-                continue
-            if not isinstance(raw_list, list):
-                try:
-                    # Try to coerce to list (for numpy arrays etc.)
-                    raw_list = list(raw_list)
-                except TypeError:
-                    continue
-
-            for rule in raw_list:
-                if not isinstance(rule, dict):
-                    continue
-                field_name = str(rule.get("field", "")).strip()
-                if not field_name:
-                    continue
-                fields_counter[field_name] += 1
-    return fields_counter
+def _bucket_rules(rules: Dict[str, Any], bucket: str) -> List[Any]:
+    raw_list = rules.get(bucket)
+    if raw_list is None or isinstance(raw_list, list):
+        return raw_list or []
+    # Guard against unexpected types (e.g., numpy arrays, scalars)
+    try:
+        return list(raw_list)
+    except TypeError:
+        return []
+
 
+def _collect_unique_fields(rules_by_row: List[Any]) -> Counter:
+    all_rules = chain.from_iterable(
+        _bucket_rules(rules, "required") + _bucket_rules(rules, "optional")
+        for rules in rules_by_row
+        if isinstance(rules, dict)
+    )
+    field_names = (str(rule["field"]).strip() for rule in all_rules if isinstance(rule, dict) and rule.get("field"))
+    return Counter(name for name in field_names if name)
 
+
+@lru_cache(maxsize=None)
 def _map_field_name(field_name: str) -> str:
     key = field_name.strip().lower()
     return BASE_FIELD_MAPPING.get(key, "other")
@@ -122,9 +124,7 @@ def build_mapping(
         raise FileNotFoundError(f"Input file not found: {input_file}")
 
     logger.info("Loading %s ...", input_file)
-    df = pd.read_parquet(input_file)
-
-    rules_by_row = _load_rules(df)
+    rules_by_row = _load_rules(_read_structured_column(input_file))
     fields_counter = _collect_unique_fields(rules_by_row)
 
     logger.info("Found %d unique field names in eligibility_structured.", len(fields_counter))
@@ -140,7 +140,7 @@ def build_mapping(
 
     # Write mapping JSON
     output_file = Path(output_json)
-    output_file.write_text(json.dumps(mapping, indent=2, ensure_ascii=False), encoding="utf-8")
+    output_file.write_bytes(orjson.dumps(mapping, option=orjson.OPT_INDENT_2))
     logger.info("Wrote field mapping to %s", output_file)
 
     # Log unmapped fields for manual review
@@ -1,35 +1,143 @@
 import numpy as np
 import pandas as pd
+import torch
 from sentence_transformers import SentenceTransformer
 from pathlib import Path
 import argparse
+import json
 
-def build_embed_doc_row(row: pd.Series) -> str:
-    name = str(row.get("scheme_name", "")).strip()
-    desc = str(row.get("description_raw", "")).strip()
-    elig = str(row.get("eligibility_raw", "")).strip()
-    state_scope = str(row.get("state_scope", "")).strip()
-    category = str(row.get("category", "")).strip()
-    source = str(row.get("source_url", "")).strip()
+EMBED_DOC_COLS = ["scheme_name", "description_raw", "eligibility_raw", "state_scope", "category", "source_url"]
+
+def build_embed_doc_row(row) -> str:
+    """Build a fallback embed_doc from a pre-stripped itertuples row."""
     parts = [
-        name,
-        "Description:\n" + desc if desc else "",
-        "Eligibility:\n" + elig if elig else "",
-        f"State scope: {state_scope}" if state_scope else "",
-        f"Category: {category}" if category else "",
-        f"Source: {source}" if source else "",
+        row.scheme_name,
+        "Description:\n" + row.description_raw if row.description_raw else "",
+        "Eligibility:\n" + row.eligibility_raw if row.eligibility_raw else "",
+        f"State scope: {row.state_scope}" if row.state_scope else "",
+        f"Category: {row.category}" if row.category else "",
+        f"Source: {row.source_url}" if row.source_url else "",
     ]
     doc = "\n\n".join([p for p in parts if p])
     if len(doc) > 4000:
         doc = doc[:3997] + "..."
     return doc
 
+def build_embed_docs(df: pd.DataFrame) -> list:
+    """Normalize the text columns once (vectorized), then build docs via itertuples."""
+    text = pd.DataFrame(
+        {c: df[c].fillna("").astype(str).str.strip() if c in df.columns else "" for c in EMBED_DOC_COLS},
+        index=df.index,
+    )
+    return [build_embed_doc_row(t) for t in text.itertuples(index=False)]
+
+# sentence-transformers pooling flags that encode_onnx can reproduce
+ONNX_POOLING_MODES = {"pooling_mode_mean_tokens": "mean", "pooling_mode_cls_token": "cls"}
+
+def read_onnx_settings(model_name: str) -> dict:
+    """
+    Read the truncation length and pooling mode from model_name's
+    sentence-transformers config (a local directory or a Hub repo).
+
+    Raises ValueError for models encode_onnx cannot reproduce: other pooling
+    modes, or modules such as Dense layers on top of the pooled output.
+    """
+    from huggingface_hub import hf_hub_download
+
+    def load(filename):
+        local = Path(model_name) / filename
+        path = local if local.exists() else hf_hub_download(model_name, filename)
+        with open(path) as f:
+            return json.load(f)
+
+    modules = {m["type"].rsplit(".", 1)[-1]: m["path"] for m in load("modules.json")}
+    if "Pooling" not in modules or set(modules) - {"Transformer", "Pooling", "Normalize"}:
+        raise ValueError(f"--onnx supports Transformer + Pooling (+ Normalize) models; {model_name} has {sorted(modules)}")
+    pooling = load(f"{modules['Pooling']}/config.json")
+    enabled = [key for key, value in pooling.items() if key.startswith("pooling_mode_") and value]
+    if len(enabled) != 1 or enabled[0] not in ONNX_POOLING_MODES:
+        raise ValueError(f"--onnx supports mean or CLS pooling; {model_name} uses {enabled}")
+    return {
+        "max_seq_length": load("sentence_bert_config.json")["max_seq_length"],
+        "pooling": ONNX_POOLING_MODES[enabled[0]],
+    }
+
+def load_onnx_encoder(model_name: str, cache_dir: str, device: str):
+    """
+    Load an ONNX Runtime export of model_name from cache_dir.
+
+    The first run exports the model to ONNX and dynamically quantizes it to
+    int8; later runs load the cached files directly. Exports are cached per
+    model name, together with the settings from read_onnx_settings. The int8
+    model is used on CPU only: on CUDA most of its quantized ops fall back to
+    the CPU, so the fp32 export is loaded there instead.
+    """
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+
+    model_dir = Path(cache_dir) / model_name.replace("/", "__")
+    fp32_dir = model_dir / "onnx_model"
+    int8_dir = model_dir / "onnx_model_int8"
+    settings_path = int8_dir / "onnx_settings.json"
+    if not (int8_dir / "model_quantized.onnx").exists() or not settings_path.exists():
+        settings = read_onnx_settings(model_name)
+        print(f"Exporting {model_name} to ONNX and quantizing to int8 (first run only)...")
+        ort_model = ORTModelForFeatureExtraction.from_pretrained(model_name, export=True)
+        ort_model.save_pretrained(fp32_dir)
+        quantizer = ORTQuantizer.from_pretrained(ort_model)
+        qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+        quantizer.quantize(save_dir=int8_dir, quantization_config=qconfig)
+        AutoTokenizer.from_pretrained(model_name).save_pretrained(int8_dir)
+        settings_path.write_text(json.dumps(settings))
+
+    if device == "cuda":
+        model_dir, file_name, provider = fp32_dir, "model.onnx", "CUDAExecutionProvider"
+    else:
+        model_dir, file_name, provider = int8_dir, "model_quantized.onnx", "CPUExecutionProvider"
+    # IO binding (optimum's CUDA default) only accepts torch tensors; encode_onnx feeds numpy.
+    model = ORTModelForFeatureExtraction.from_pretrained(
+        model_dir, file_name=file_name, provider=provider, use_io_binding=False
+    )
+    tokenizer = AutoTokenizer.from_pretrained(int8_dir)
+    return model, tokenizer, json.loads(settings_path.read_text())
+
+def encode_onnx(model, tokenizer, settings: dict, docs: list, batch_size: int) -> np.ndarray:
+    """
+    Pool and L2-normalize ONNX token embeddings as the model's
+    sentence-transformers config does, matching model.encode(normalize_embeddings=True)
+    up to int8 quantization error.
+    """
+    batches = []
+    for i in range(0, len(docs), batch_size):
+        enc = tokenizer(
+            docs[i:i + batch_size],
+            padding=True,
+            truncation=True,
+            max_length=settings["max_seq_length"],
+            return_tensors="np",
+        )
+        hidden = model(input_ids=enc["input_ids"], attention_mask=enc["attention_mask"]).last_hidden_state
+        if settings["pooling"] == "cls":
+            pooled = hidden[:, 0].copy()
+        else:
+            mask = enc["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        batches.append(pooled.astype(np.float32))
+    if not batches:
+        return np.empty((0, model.config.hidden_size), dtype=np.float32)
+    return np.vstack(batches)
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--input", default="scheme_embed_docs.parquet")
     parser.add_argument("--model", default="sentence-transformers/paraphrase-mpnet-base-v2")
     parser.add_argument("--out", default="faiss_index/scheme_embeddings.npy")
     parser.add_argument("--ids_out", default="faiss_index/scheme_ids.npy")
+    parser.add_argument("--batch_size", type=int, default=None, help="Encode batch size (default: 256 on CUDA, 64 on CPU)")
+    parser.add_argument("--onnx", action="store_true", help="Encode with a cached ONNX Runtime export of --model (int8-quantized on CPU, fp32 on CUDA)")
+    parser.add_argument("--onnx_cache", default="cache", help="Directory for the exported ONNX models")
     args = parser.parse_args()
 
     print("Loading scheme data...")
@@ -37,35 +145,67 @@ def main():
 
     if 'embed_doc' not in df.columns:
         if {'scheme_name','description_raw','eligibility_raw'}.issubset(df.columns):
-            df['embed_doc'] = df.apply(build_embed_doc_row, axis=1)
+            df['embed_doc'] = build_embed_docs(df)
         else:
             raise ValueError("Input must have 'embed_doc' or the core text columns ('scheme_name','description_raw','eligibility_raw')")
     if 'scheme_id' not in df.columns:
         # If not present, derive from index
         df['scheme_id'] = df.index.astype(str)
 
-    print("Loading sentence transformer model...")
-    model = SentenceTransformer(args.model)
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    batch_size = args.batch_size or (256 if device == "cuda" else 64)
+
+    if args.onnx:
+        print(f"Loading ONNX model on {device}...")
+        onnx_model, tokenizer, onnx_settings = load_onnx_encoder(args.model, args.onnx_cache, device)
+        dim = onnx_model.config.hidden_size
+
+        def encode(docs):
+            return encode_onnx(onnx_model, tokenizer, onnx_settings, docs, batch_size)
+    else:
+        print(f"Loading sentence transformer model on {device}...")
+        model = SentenceTransformer(args.model, device=device)
+        if device == "cuda":
+            # fp16 halves memory traffic and runs on tensor cores; output is cast back to float32 below
+            model = model.half()
+        dim = model.get_sentence_embedding_dimension()
+
+        def encode(docs):
+            return model.encode(
+                docs,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                batch_size=batch_size,
+                show_progress_bar=False
+            )
 
     print("Computing embeddings (this may take a while)...")
     embed_docs = df['embed_doc'].tolist()
-    embeddings = model.encode(
-        embed_docs,
-        convert_to_numpy=True,
-        normalize_embeddings=True,
-        batch_size=64,
-        show_progress_bar=True
-    )
+    n_docs = len(embed_docs)
+    # Encode longest-first so each batch pads to similar lengths, then scatter
+    # rows back to the original order to stay aligned with scheme_ids.
+    order = np.argsort([len(d) for d in embed_docs], kind="stable")[::-1]
+
+    # Write each chunk straight into a memory-mapped .npy so peak RAM is one
+    # chunk of vectors rather than the full N x dim matrix.
+    Path(args.out).parent.mkdir(exist_ok=True, parents=True)
+    embeddings = np.lib.format.open_memmap(args.out, mode="w+", dtype=np.float32, shape=(n_docs, dim))
+    chunk_size = batch_size * 16
+    for start in range(0, n_docs, chunk_size):
+        idx = order[start:start + chunk_size]
+        embeddings[idx] = encode([embed_docs[i] for i in idx])
+        print(f"  encoded {min(start + chunk_size, n_docs)}/{n_docs}")
+    embeddings.flush()
+    embeddings_shape = embeddings.shape
+    del embeddings
 
     scheme_ids = df['scheme_id'].astype(str).values.astype("U")
 
-    Path(args.out).parent.mkdir(exist_ok=True, parents=True)
     print("Saving results...")
-    np.save(args.out, embeddings.astype(np.float32))
     np.save(args.ids_out, scheme_ids)
 
     print("\nResults saved successfully:")
-    print(f"Embeddings shape: {embeddings.shape} (num_schemes × embedding_dim)")
+    print(f"Embeddings shape: {embeddings_shape} (num_schemes × embedding_dim)")
     print(f"Scheme IDs shape: {scheme_ids.shape}")
 
 if __name__ == "__main__":
@@ -1,5 +1,5 @@
+import orjson
 import pandas as pd
-import json
 
 SCHEME_IDS_TO_CHECK = [
     "a23c0261-7711-4213-aecf-6b7c4cc844ed",  # Diggy
@@ -7,26 +7,32 @@ SCHEME_IDS_TO_CHECK = [
     "94189f08-1583-4be3-b0e4-0c2043bdf6c4",  # Shednet House
 ]
 
-df = pd.read_parquet("schemes_with_rules.parquet")
+df = pd.read_parquet(
+    "schemes_with_rules.parquet",
+    columns=["scheme_id", "scheme_name", "eligibility_structured"],
+).set_index("scheme_id", drop=False)
 
 for sid in SCHEME_IDS_TO_CHECK:
-    row = df[df["scheme_id"] == sid]
     print("=" * 80)
     print("Scheme ID:", sid)
-    if row.empty:
+    try:
+        row = df.loc[sid]
+    except KeyError:
         print("⚠️ No row found for this scheme_id")
         continue
+    if isinstance(row, pd.DataFrame):
+        row = row.iloc[0]
 
-    name = row["scheme_name"].iloc[0] if hasattr(row["scheme_name"], 'iloc') else row["scheme_name"].values[0]
+    name = row["scheme_name"]
     print("Name:", name)
 
-    es = row["eligibility_structured"].values[0]
+    es = row["eligibility_structured"]
     print("Raw eligibility_structured type:", type(es))
 
     # If it's a string, try to parse
     if isinstance(es, str):
         try:
-            es_json = json.loads(es)
+            es_json = orjson.loads(es)
             print("Parsed JSON keys:", es_json.keys())
             print("Required rules count:", len(es_json.get("required", [])))
             print("Optional rules count:", len(es_json.get("optional", [])))
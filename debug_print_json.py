@@ -1,14 +1,22 @@
-import pandas as pd
-import json
+import orjson
 import argparse
+import pyarrow.parquet as pq
 
 parser = argparse.ArgumentParser()
 parser.add_argument("--parquet", default="schemes_with_rules.parquet")
 parser.add_argument("--id", default="a23c0261-7711-4213-aecf-6b7c4cc844ed")
 args = parser.parse_args()
 
-df = pd.read_parquet(args.parquet)
-row = df[df.scheme_id == args.id].iloc[0]
+# The id filter is pushed into the scan, so row groups that cannot hold it are skipped
+rows = pq.read_table(
+    args.parquet,
+    columns=["scheme_id", "eligibility_structured"],
+    filters=[("scheme_id", "=", args.id)],
+).to_pylist()
+if not rows:
+    print(f"No row found for scheme_id {args.id}")
+    raise SystemExit(1)
+row = rows[0]
 
 print("Raw eligibility_structured JSON:\n")
 print(row["eligibility_structured"])
@@ -16,7 +24,7 @@ print(row["eligibility_structured"])
 obj = row["eligibility_structured"]
 if isinstance(obj, str):
     try:
-        obj = json.loads(obj)
+        obj = orjson.loads(obj)
     except Exception:
         obj = {}
 
@@ -1,5 +1,4 @@
-import json
-import pandas as pd
+import orjson
 from pathlib import Path
 import importlib
 import sys
@@ -31,8 +30,17 @@ if not DATA_FILE.exists():
     print("ERROR: schemes_with_rules.parquet not found. Run extractor first.")
     raise SystemExit(1)
 
-df = pd.read_parquet(DATA_FILE).set_index("scheme_id")
-print(f"Loaded {len(df)} schemes from {DATA_FILE}\n")
+import pyarrow.parquet as pq  # deferred: only worth loading once the file is known to exist
+
+MATCH_COLUMNS = ["scheme_id", "scheme_name", "eligibility_structured", "eligibility_raw", "description_raw"]
+available = set(pq.read_schema(DATA_FILE).names)
+# Only the requested ids are read; row groups whose scheme_id stats exclude them are skipped
+df = pq.read_table(
+    DATA_FILE,
+    columns=[c for c in MATCH_COLUMNS if c in available],
+    filters=[("scheme_id", "in", SCHEME_IDS)],
+).to_pandas().set_index("scheme_id")
+print(f"Loaded {len(df)} of {len(SCHEME_IDS)} requested schemes from {DATA_FILE}\n")
 
 # Try to import your rule evaluator (adapt if module name differs).
 EVAL_MODULE_NAME = "rule_evaluator"
@@ -55,7 +63,7 @@ mapping_path = Path("rule_field_to_profile_field.json")
 field_mapping = {}
 if mapping_path.exists():
     try:
-        field_mapping = json.load(open(mapping_path, "r", encoding="utf-8"))
+        field_mapping = orjson.loads(mapping_path.read_bytes())
         print(f"Loaded field mapping from {mapping_path} (len={len(field_mapping)})")
     except Exception as e:
         print(f"Failed to load mapping {mapping_path}: {e}")
@@ -78,7 +86,7 @@ for scheme_id in SCHEME_IDS:
     # structured may be string; try parse
     if isinstance(structured, str):
         try:
-            structured_obj = json.loads(structured)
+            structured_obj = orjson.loads(structured)
         except Exception:
             structured_obj = None
     else:
@@ -132,7 +140,7 @@ for scheme_id in SCHEME_IDS:
                 # Call with correct signature: (eligibility_structured, user_profile)
                 res = eval_fn(structured_obj, profile)
                 print("\nEvaluator result (raw):")
-                print(json.dumps(res, indent=2, default=str)[:4000])
+                print(orjson.dumps(res, option=orjson.OPT_INDENT_2, default=str).decode()[:4000])
             except Exception as e:
                 print("Evaluator call failed:", e)
         else:
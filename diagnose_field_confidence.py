@@ -1,6 +1,6 @@
-import json
+import orjson
 import statistics
-import pandas as pd
+from functools import lru_cache
 from pathlib import Path
 from collections import defaultdict, Counter
 
@@ -9,30 +9,47 @@ if not P.exists():
     print("ERROR: schemes_with_rules.parquet not found. Run extraction first.")
     raise SystemExit(1)
 
-df = pd.read_parquet(P)
+import pyarrow.parquet as pq  # deferred: only worth loading once the file is known to exist
+
 col = "eligibility_structured"
-if col not in df.columns:
+pf = pq.ParquetFile(P)
+available = set(pf.schema_arrow.names)
+if col not in available:
     print(f"Column '{col}' missing.")
     raise SystemExit(1)
+read_cols = [c for c in ("eligibility_raw", col) if c in available]
+
+@lru_cache(maxsize=4096)
+def _parse(s):
+    # Schemes with no extracted rules share identical payloads; parse those once.
+    try:
+        obj = orjson.loads(s)
+        return obj if isinstance(obj, dict) else {}
+    except Exception:
+        return {}
 
 def safe_load(x):
     if x is None:
         return {}
     if isinstance(x, str):
-        try:
-            obj = json.loads(x)
-            return obj if isinstance(obj, dict) else {}
-        except Exception:
-            return {}
+        return _parse(x)
     if isinstance(x, dict):
         return x
     return {}
 
 field_stats = defaultdict(lambda: {"count": 0, "confidences": [], "sources": Counter(), "examples": []})
 
-for _, row in df.iterrows():
-    raw = row.get("eligibility_raw", "") or ""
-    obj = safe_load(row[col])
+def iter_rows():
+    """Yield (eligibility_raw, eligibility_structured) one row group at a time."""
+    for rg in range(pf.num_row_groups):
+        batch = pf.read_row_group(rg, columns=read_cols).to_pydict()
+        structured = batch[col]
+        raws = batch.get("eligibility_raw") or [None] * len(structured)
+        yield from zip(raws, structured)
+
+for raw, structured in iter_rows():
+    raw = raw or ""
+    obj = safe_load(structured)
     if not isinstance(obj, dict):
         obj = {}
     for bucket in ("required", "optional"):
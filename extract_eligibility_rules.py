@@ -1,12 +1,23 @@
 # extract_eligibility_rules.py
 import os
 import json
+import hashlib
 import logging
 import re
+import threading
+import orjson
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
+import numpy as np
 import pandas as pd
-from typing import Dict, Any, List, Optional
+import pyarrow as pa
+import pyarrow.parquet as pq
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
+from itertools import chain
 from deterministic_patterns import extract_deterministic_rules
 from extract_rules_regex import extract_rules_regex
 from profile_value_normalizers import normalize_state
@@ -22,6 +33,144 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Measured with fork-started pools: ~20 ms start-up, then ~41 us of extraction
+# against ~11 us of pickling per scheme, so the pool breaks even near 2.7k rows
+# with 2 workers (1.3k with 4). Spawn-started pools (macOS/Windows) took ~2 s
+# to start 4 workers, so there only much larger inputs gain.
+PARALLEL_MIN_ROWS = 5000
+LLM_CONCURRENCY = 8  # LLM calls in flight at once; they are network-bound
+ROW_GROUP_SIZE = 2048  # output row groups; small enough for scheme_id filters to skip most
+RULE_CACHE_SIZE = 4096  # distinct (eligibility, description) texts whose rules are kept
+# The only columns rule extraction reads; the rest pass through to the output untouched.
+RULE_INPUT_COLUMNS = ['scheme_id', 'eligibility_raw', 'description_raw']
+# Substring semantics on purpose: "required"/"requirement" count as mandatory wording.
+REQUIRED_KW_RE = re.compile(r'must|require|shall|need to', re.IGNORECASE)
+SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Patterns used by remap_other_clauses to turn 'other' clauses into concrete fields.
+# Occupation and category are matched against the lower-cased span. Spans are a
+# single clause long and extract_rules_regex does not currently emit 'other'
+# clauses, so plain compiled regexes are enough here (no multi-pattern automaton).
+REMAP_STATE_RE = re.compile(r"(?:native|resident|resident of|domiciled in|resident of the state of)\s+([A-Za-z &.-]+)", re.I)
+REMAP_OCCUPATION_RE = re.compile(r"\b(farmer|agriculturist|fisherman|worker|student|entrepreneur|artisan|micro|small)\b")
+REMAP_LAND_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(?:hectare|ha)", re.I)
+REMAP_INCOME_RE = re.compile(r"(?:annual\s+income|income|family income|household income)[^0-9₹RsRs.\d\n\r:]{0,20}[₹Rs\.\s]*([0-9,]+(?:\.\d+)?)", re.I)
+REMAP_AGE_RE = re.compile(r"age\s*(?:group|between|from)?\s*(\d{1,3})(?:\s*(?:-|to)\s*(\d{1,3}))?", re.I)
+REMAP_CATEGORY_RE = re.compile(r"\b(sc|st|obc|general|brahmin|minority|muslim|sikh|christian)\b")
+
+# _parse_rule patterns as (pattern, field group, operator, value group), tried in order.
+PARSE_RULE_PATTERNS = [
+    (re.compile(r'(\w+)\s+(must|should)\s+be\s+([\w\s]+)', re.IGNORECASE), 1, '==', 3),
+    (re.compile(r'(\w+)\s+(must|should)\s+have\s+([\w\s]+)', re.IGNORECASE), 1, 'has', 3),
+    (re.compile(r'(\w+)\s+(?:must|should)\s+be\s+at\s+least\s+([\d,]+)', re.IGNORECASE), 1, '>=', 2),
+    (re.compile(r'(\w+)\s+(?:must|should)\s+be\s+at\s+most\s+([\d,]+)', re.IGNORECASE), 1, '<=', 2),
+]
+
+OCCUPATION_CANONICAL = {
+    "farmer": "Farmer",
+    "fish farmer": "Farmer",
+    "agriculturist": "Farmer",
+    "horticulture farmer": "Farmer",
+    "weaver": "Weaver",
+    "worker": "Worker",
+    "construction worker": "Worker",
+    "agricultural labourer": "Worker",
+    "landless labourer": "Worker",
+    "student": "Student",
+    "candidate": "Candidate",
+    "beneficiary": "Beneficiary",
+    "entrepreneur": "Entrepreneur",
+    "trader": "Trader",
+    "artisan": "Artisan",
+    "bride": "Bride",
+    "applicant": "Applicant",
+}
+
+@lru_cache(maxsize=4096)
+def canonicalize_occupation(occ: str) -> str:
+    key = occ.strip().lower()
+    return OCCUPATION_CANONICAL.get(key, occ.strip().title())
+
+def remap_other_clauses(clauses, text):
+    """
+    Remap clauses with field 'other' into more specific fields when patterns match.
+    Returns new list of clauses (modifies confidence and source when remapped).
+    """
+    # Fast path: the regex extractor rarely emits 'other' clauses
+    if not any(c.get("field") == "other" and c.get("text_span") for c in clauses):
+        return clauses
+    # Clauses come fresh from extract_rules_regex for this scheme, so they
+    # are updated in place rather than copied.
+    new_clauses = []
+    for c in clauses:
+        if c.get("field") != "other" or not c.get("text_span"):
+            new_clauses.append(c)
+            continue
+
+        span = c.get("text_span", "") or ""
+        lower = span.lower()
+        remapped = False
+
+        # 1) STATE / NATIVE
+        m = REMAP_STATE_RE.search(span)
+        if m:
+            state = m.group(1).strip()
+            c.update({"field": "state", "value": state, "op": "==", "confidence": max(c.get("confidence",0.5), 0.9), "source":"heuristic_regex"})
+            new_clauses.append(c)
+            remapped = True
+
+        # 2) OCCUPATION
+        occ_match = REMAP_OCCUPATION_RE.search(lower) if not remapped else None
+        if occ_match:
+            occ = occ_match.group(1)
+            c.update({"field":"occupation", "value": occ.capitalize(), "op":"==", "confidence": max(c.get("confidence",0.5), 0.85), "source":"heuristic_regex"})
+            new_clauses.append(c)
+            remapped = True
+
+        # 3) LAND AREA (hectare/ha)
+        if not remapped:
+            m = REMAP_LAND_RE.search(span)
+            if m:
+                c.update({"field":"land_area", "value": float(m.group(1)), "op": ">=", "confidence": max(c.get("confidence",0.5),0.9), "source":"heuristic_regex"})
+                new_clauses.append(c)
+                remapped = True
+
+        # 4) INCOME CAPS (₹ or numbers with 'income' context)
+        if not remapped:
+            m = REMAP_INCOME_RE.search(span)
+            if m:
+                val = float(m.group(1).replace(",",""))
+                c.update({"field":"income_annual", "value": val, "op":"<=", "confidence": max(c.get("confidence",0.5),0.9), "source":"heuristic_regex"})
+                new_clauses.append(c)
+                remapped = True
+
+        # 5) AGE ranges / min-max
+        if not remapped:
+            m = REMAP_AGE_RE.search(span)
+            if m:
+                if m.group(2):
+                    c.update({"field":"age", "value": {"min": int(m.group(1)), "max": int(m.group(2))}, "op":"between", "confidence": max(c.get("confidence",0.5),0.9), "source":"heuristic_regex"})
+                    new_clauses.append(c)
+                else:
+                    c.update({"field":"age", "value": int(m.group(1)), "op":">=", "confidence": max(c.get("confidence",0.5),0.85), "source":"heuristic_regex"})
+                    new_clauses.append(c)
+                remapped = True
+
+        # 6) COMMUNITY / CATEGORY (SC/ST/OBC/Brahmin etc.)
+        if not remapped:
+            m = REMAP_CATEGORY_RE.search(lower)
+            if m:
+                c.update({"field":"category", "value": m.group(1).upper(), "op":"==", "confidence": max(c.get("confidence",0.5),0.85), "source":"heuristic_regex"})
+                new_clauses.append(c)
+                remapped = True
+
+        # 7) Default: keep as 'other' but reduce confidence so it won't dominate
+        if not remapped:
+            c["confidence"] = min(c.get("confidence",0.5), 0.6)
+            new_clauses.append(c)
+
+    return new_clauses
+
 class EligibilityExtractor:
     def __init__(self, config: Dict[str, Any] = None):
         self.config = config or {
@@ -31,16 +180,41 @@ class EligibilityExtractor:
             'max_retries': 3,
             'delay_between_requests': 1.0,
             'llm_fallback': False,
-            'limit': None
+            'limit': None,
+            'workers': None,
+            'llm_concurrency': LLM_CONCURRENCY
         }
         self.df = None
         self.processed_count = 0
         self._llm_cache: Dict[str, Any] = {}
+        self._llm_cache_lock = threading.Lock()
+        # blake2b(eligibility + description) -> orjson-encoded rules, least recently used first
+        self._rule_cache: "OrderedDict[bytes, bytes]" = OrderedDict()
+        # Gemini client, configured on first use and shared by the LLM threads
+        self._genai_model = None
+        self._genai_lock = threading.Lock()
         
     def load_data(self) -> bool:
-        """Load the input parquet file."""
+        """Load the columns rule extraction needs from the input parquet file."""
         try:
-            self.df = pd.read_parquet(self.config['input_file'])
+            # Only the extraction inputs (and any earlier results) are loaded;
+            # save_results splices the new column back into the full input table.
+            source = pq.ParquetFile(self.config['input_file'])
+            columns = [c for c in RULE_INPUT_COLUMNS + ['eligibility_structured'] if c in source.schema_arrow.names]
+            limit = self.config.get('limit')
+            if isinstance(limit, int) and limit > 0:
+                # Only the leading `limit` rows are decoded; save_results copies
+                # the rest through unchanged.
+                batches, rows = [], 0
+                for batch in source.iter_batches(batch_size=ROW_GROUP_SIZE, columns=columns):
+                    batches.append(batch)
+                    rows += batch.num_rows
+                    if rows >= limit:
+                        break
+                schema = pa.schema([source.schema_arrow.field(c) for c in columns])
+                self.df = pa.Table.from_batches(batches, schema=schema).slice(0, limit).to_pandas()
+            else:
+                self.df = pd.read_parquet(self.config['input_file'], columns=columns)
             logger.info(f"Loaded {len(self.df)} schemes from {self.config['input_file']}")
             return True
         except Exception as e:
@@ -64,140 +238,146 @@ class EligibilityExtractor:
             work_df = self.df.iloc[:limit]
         else:
             work_df = self.df
-        for i in range(0, len(work_df), batch_size):
-            batch = work_df.iloc[i:i + batch_size]
-            logger.info(f"Processing batch {i//batch_size + 1}/{(total_schemes + batch_size - 1)//batch_size}")
-            
-            for _, row in batch.iterrows():
-                try:
-                    rules = self._extract_rules_for_scheme(row)
-                    if self.config.get('llm_fallback'):
-                        rules = self._apply_llm_fallback_if_needed(row.get('scheme_id', ''), str(row.get('eligibility_raw') or ''), rules)
-                    self.df.at[row.name, 'eligibility_structured'] = json.dumps(rules)
-                    self.processed_count += 1
-                except Exception as e:
-                    logger.error(f"Error processing scheme {row.get('scheme_id', 'unknown')}: {str(e)}")
-                    self.df.at[row.name, 'eligibility_structured'] = json.dumps({
-                        "required": [],
-                        "optional": [],
-                        "error": str(e)
-                    })
+        # Results are collected in a list and written back as one column
+        # assignment at the end.
+        records = self._records(work_df)
+        nproc = self.config.get('workers') or os.cpu_count() or 1
+        if nproc > 1 and len(records) >= PARALLEL_MIN_ROWS:
+            logger.info(f"Processing {len(records)} schemes across {nproc} worker processes")
+            with ProcessPoolExecutor(max_workers=nproc, initializer=_init_worker,
+                                     initargs=(self.config,)) as executor:
+                outcomes = self._structure_records(records, executor)
+        else:
+            outcomes = [None] * len(records)
+            for i in range(0, len(records), batch_size):
+                logger.info(f"Processing batch {i//batch_size + 1}/{(total_schemes + batch_size - 1)//batch_size}")
+                outcomes[i:i + batch_size] = self._structure_records(records[i:i + batch_size])
+        outcomes = self._apply_llm_passes(records, outcomes)
+
+        # eligibility_structured is stored as a JSON string rather than an Arrow
+        # struct: clause values mix strings, numbers, lists and {min, max} dicts,
+        # which a fixed struct schema can only hold by stringifying them anyway.
+        # Rows past `limit` keep whatever they already had (None if the column is new).
+        structured = np.empty(len(self.df), dtype=object)
+        if 'eligibility_structured' in self.df.columns:
+            structured[:] = self.df['eligibility_structured'].to_numpy(dtype=object)
+        structured[:len(outcomes)] = [orjson.dumps(rules).decode() for rules, _ in outcomes]
+        self.processed_count += sum(ok for _, ok in outcomes)
+        self.df['eligibility_structured'] = structured
 
         return True
 
+    @staticmethod
+    def _error_rules(row: Dict[str, Any], e: Exception) -> Dict[str, Any]:
+        logger.error(f"Error processing scheme {row.get('scheme_id', 'unknown')}: {str(e)}")
+        return {
+            "required": [],
+            "optional": [],
+            "error": str(e)
+        }
+
+    def _structure_scheme(self, row: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        """Extract rules for one scheme record; returns (rules, succeeded)."""
+        try:
+            return self._extract_rules_for_scheme(row), True
+        except Exception as e:
+            return self._error_rules(row, e), False
+
+    def _apply_llm_pass(self, row: Dict[str, Any], rules: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        """Run the LLM fallback over one scheme's extracted rules; returns (rules, succeeded)."""
+        try:
+            return self._apply_llm_fallback_if_needed(row.get('scheme_id', ''), str(row.get('eligibility_raw') or ''), rules), True
+        except Exception as e:
+            return self._error_rules(row, e), False
+
+    @staticmethod
+    def _records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Turn the rule input columns of `df` into plain per-scheme dicts."""
+        inputs = df[[c for c in RULE_INPUT_COLUMNS if c in df.columns]]
+        # Text columns are normalised to str once here rather than per row;
+        # missing text becomes '' so it is reported as no_eligibility_text.
+        text_cols = [c for c in ('eligibility_raw', 'description_raw') if c in inputs.columns]
+        inputs = inputs.assign(**{c: inputs[c].fillna('').astype(str) for c in text_cols})
+        # itertuples(name=None) yields bare tuples; zipping them into dicts is
+        # cheaper than iterrows() or to_dict('records'), which box every value.
+        cols = list(inputs.columns)
+        return [dict(zip(cols, t)) for t in inputs.itertuples(index=False, name=None)]
+
+    def _structure_records(self, records: List[Dict[str, Any]],
+                           executor: Optional[ProcessPoolExecutor] = None) -> List[Tuple[Dict[str, Any], bool]]:
+        """Extract rules for `records`, on `executor`'s worker processes if given."""
+        if executor is not None:
+            return list(executor.map(_worker_structure, records, chunksize=64))
+        return [self._structure_scheme(row) for row in records]
+
+    def _apply_llm_passes(self, records: List[Dict[str, Any]],
+                          outcomes: List[Tuple[Dict[str, Any], bool]]) -> List[Tuple[Dict[str, Any], bool]]:
+        # The LLM fallback runs in this process, after extraction, so the
+        # llm_cache.jsonl writes stay in one place. Requests are I/O-bound, so
+        # several are kept in flight on threads.
+        if not self.config.get('llm_fallback'):
+            return outcomes
+        pending = [j for j, (_, ok) in enumerate(outcomes) if ok]
+        llm_workers = self.config.get('llm_concurrency') or LLM_CONCURRENCY
+        logger.info(f"Applying LLM fallback to {len(pending)} schemes ({llm_workers} concurrent requests)...")
+        with ThreadPoolExecutor(max_workers=llm_workers) as executor:
+            passed = executor.map(lambda j: self._apply_llm_pass(records[j], outcomes[j][0]), pending)
+            for j, outcome in zip(pending, passed):
+                outcomes[j] = outcome
+        return outcomes
+
     def _extract_rules_for_scheme(self, scheme_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Extract structured eligibility rules for a single scheme."""
+        """Extract structured eligibility rules for a single scheme.
+
+        Results are memoized on the scheme's eligibility and description text,
+        since boilerplate paragraphs repeat across schemes. The cache holds the
+        encoded result, so every caller gets its own copy to mutate, and keeps
+        only the RULE_CACHE_SIZE most recently used texts so memory stays
+        bounded however large the input is.
+        """
+        elig = scheme_data.get('eligibility_raw') or ''
+        desc = scheme_data.get('description_raw') or ''
+        if not (isinstance(elig, str) and isinstance(desc, str)):
+            return self._extract_rules_uncached(scheme_data)
+        h = hashlib.blake2b(elig.encode('utf-8'), digest_size=16)
+        h.update(b'\0')
+        h.update(desc.encode('utf-8'))
+        key = h.digest()
+        cached = self._rule_cache.get(key)
+        if cached is not None:
+            self._rule_cache.move_to_end(key)
+            return orjson.loads(cached)
+        result = self._extract_rules_uncached(scheme_data)
+        self._rule_cache[key] = orjson.dumps(result)
+        if len(self._rule_cache) > RULE_CACHE_SIZE:
+            self._rule_cache.popitem(last=False)
+        return result
+
+    def _extract_rules_uncached(self, scheme_data: Dict[str, Any]) -> Dict[str, Any]:
+        raw = scheme_data.get('eligibility_raw', '') or ''
         out = {
             "required": [],
             "optional": [],
             "notes": {},
-            "source_text": (scheme_data.get('eligibility_raw', '') or '')[:500] + ("..." if len(scheme_data.get('eligibility_raw', '') or '') > 500 else "")
+            "source_text": raw[:500] + "..." if len(raw) > 500 else raw[:500]
         }
 
-        elig_text = str(scheme_data.get('eligibility_raw') or '')
+        elig_text = raw if isinstance(raw, str) else str(raw)
         desc_text = str(scheme_data.get('description_raw') or '')
         combined_text = (elig_text + " " + desc_text).strip()
 
-        # ---- begin: post-process OTHER clauses -> concrete fields ----
-        def remap_other_clauses(clauses, text):
-            """
-            Remap clauses with field 'other' into more specific fields when patterns match.
-            Returns new list of clauses (modifies confidence and source when remapped).
-            """
-            new_clauses = []
-            for c in clauses:
-                if c.get("field") != "other" or not c.get("text_span"):
-                    new_clauses.append(c)
-                    continue
-
-                span = c.get("text_span", "") or ""
-                lower = span.lower()
-                remapped = False
-
-                # 1) STATE / NATIVE
-                m = re.search(r"(?:native|resident|resident of|domiciled in|resident of the state of)\s+([A-Za-z &.-]+)", span, re.I)
-                if m:
-                    state = m.group(1).strip()
-                    new_clauses.append({**c, "field": "state", "value": state, "op": "==", "confidence": max(c.get("confidence",0.5), 0.9), "source":"heuristic_regex"})
-                    remapped = True
-
-                # 2) OCCUPATION
-                if not remapped and re.search(r"\b(farmer|agriculturist|fisherman|worker|student|entrepreneur|artisan|micro|small)\b", lower):
-                    occ = re.search(r"\b(farmer|agriculturist|fisherman|worker|student|entrepreneur|artisan|micro|small)\b", lower).group(1)
-                    new_clauses.append({**c, "field":"occupation", "value": occ.capitalize(), "op":"==", "confidence": max(c.get("confidence",0.5), 0.85), "source":"heuristic_regex"})
-                    remapped = True
-
-                # 3) LAND AREA (hectare/ha)
-                if not remapped:
-                    m = re.search(r"(\d+(?:\.\d+)?)\s*(?:hectare|ha)", span, re.I)
-                    if m:
-                        new_clauses.append({**c, "field":"land_area", "value": float(m.group(1)), "op": ">=", "confidence": max(c.get("confidence",0.5),0.9), "source":"heuristic_regex"})
-                        remapped = True
-
-                # 4) INCOME CAPS (₹ or numbers with 'income' context)
-                if not remapped:
-                    m = re.search(r"(?:annual\s+income|income|family income|household income)[^0-9₹RsRs.\d\n\r:]{0,20}[₹Rs\.\s]*([0-9,]+(?:\.\d+)?)", span, re.I)
-                    if m:
-                        val = float(m.group(1).replace(",",""))
-                        new_clauses.append({**c, "field":"income_annual", "value": val, "op":"<=", "confidence": max(c.get("confidence",0.5),0.9), "source":"heuristic_regex"})
-                        remapped = True
-
-                # 5) AGE ranges / min-max
-                if not remapped:
-                    m = re.search(r"age\s*(?:group|between|from)?\s*(\d{1,3})(?:\s*(?:-|to)\s*(\d{1,3}))?", span, re.I)
-                    if m:
-                        if m.group(2):
-                            new_clauses.append({**c, "field":"age", "value": {"min": int(m.group(1)), "max": int(m.group(2))}, "op":"between", "confidence": max(c.get("confidence",0.5),0.9), "source":"heuristic_regex"})
-                        else:
-                            new_clauses.append({**c, "field":"age", "value": int(m.group(1)), "op":">=", "confidence": max(c.get("confidence",0.5),0.85), "source":"heuristic_regex"})
-                        remapped = True
-
-                # 6) COMMUNITY / CATEGORY (SC/ST/OBC/Brahmin etc.)
-                if not remapped:
-                    m = re.search(r"\b(sc|st|obc|general|brahmin|minority|muslim|sikh|christian)\b", lower)
-                    if m:
-                        new_clauses.append({**c, "field":"category", "value": m.group(1).upper(), "op":"==", "confidence": max(c.get("confidence",0.5),0.85), "source":"heuristic_regex"})
-                        remapped = True
-
-                # 7) Default: keep as 'other' but reduce confidence so it won't dominate
-                if not remapped:
-                    c_mod = dict(c)
-                    c_mod["confidence"] = min(c_mod.get("confidence",0.5), 0.6)
-                    new_clauses.append(c_mod)
-
-            return new_clauses
-        # ---- end: post-process OTHER clauses ----
-
         # Prefer the simplified regex extractor first
         det_struct = extract_rules_regex(combined_text)
         required_rules = det_struct.get("required", []) if isinstance(det_struct, dict) else []
         optional_rules = det_struct.get("optional", []) if isinstance(det_struct, dict) else []
 
         if required_rules or optional_rules:
-            def normalize_ops(rule):
-                op = rule.get("operator")
-                if op == "==":
-                    rule["operator"] = "="
-                # accept 'op' alias
-                if not rule.get("operator") and rule.get("op"):
-                    rule["operator"] = rule["op"].replace("==","=")
-                # field/value normalization
-                f = str(rule.get("field") or "").lower()
-                v = rule.get("value")
-                if f == "state" and isinstance(v, str):
-                    rule["value"] = normalize_state(v) or v
-                if f == "occupation" and isinstance(v, str):
-                    rule["value"] = self.canonicalize_occupation(v)
-                if f == "land_area":
-                    rule = self.ensure_land_area_hectares(rule)
-                return rule
-
             # Remap 'other' clauses before normalization
             req_remapped = remap_other_clauses(required_rules, elig_text or desc_text)
             opt_remapped = remap_other_clauses(optional_rules, elig_text or desc_text)
 
-            out["required"] = [normalize_ops(r) for r in req_remapped]
-            out["optional"] = [normalize_ops(r) for r in opt_remapped]
+            out["required"] = [self._normalize_rule(r) for r in req_remapped]
+            out["optional"] = [self._normalize_rule(r) for r in opt_remapped]
             out["notes"] = {"deterministic": True, "rule_count": len(out["required"]) + len(out["optional"]) }
             return out
 
@@ -205,6 +385,24 @@ class EligibilityExtractor:
             out["notes"] = {"deterministic": False, "reason": "no_eligibility_text"}
             return out
 
+    def _normalize_rule(self, rule: Dict[str, Any]) -> Dict[str, Any]:
+        op = rule.get("operator")
+        if op == "==":
+            rule["operator"] = "="
+        # accept 'op' alias
+        if not rule.get("operator") and rule.get("op"):
+            rule["operator"] = rule["op"].replace("==","=")
+        # field/value normalization
+        f = str(rule.get("field") or "").lower()
+        v = rule.get("value")
+        if f == "state" and isinstance(v, str):
+            rule["value"] = normalize_state(v) or v
+        if f == "occupation" and isinstance(v, str):
+            rule["value"] = self.canonicalize_occupation(v)
+        if f == "land_area":
+            rule = self.ensure_land_area_hectares(rule)
+        return rule
+
     def _apply_llm_fallback_if_needed(self, scheme_id: str, elig_text: str, structured: Dict[str, Any]) -> Dict[str, Any]:
         if not isinstance(structured, dict):
             return structured
@@ -212,27 +410,19 @@ class EligibilityExtractor:
             structured['required'] = []
         if not isinstance(structured.get('optional'), list):
             structured['optional'] = []
-        def best_conf(field: str) -> float:
-            confs = []
-            for c in structured.get('required', []):
-                if isinstance(c, dict) and str(c.get('field')).lower() == field:
-                    try:
-                        confs.append(float(c.get('confidence', 0.0)))
-                    except Exception:
-                        pass
-            for c in structured.get('optional', []):
-                if isinstance(c, dict) and str(c.get('field')).lower() == field:
-                    try:
-                        confs.append(float(c.get('confidence', 0.0)))
-                    except Exception:
-                        pass
-            return max(confs) if confs else 0.0
-        def has_field(field: str) -> bool:
-            return any(isinstance(c, dict) and str(c.get('field')).lower() == field for c in structured.get('required', [])) or any(isinstance(c, dict) and str(c.get('field')).lower() == field for c in structured.get('optional', []))
-        llm_needed = []
-        for f in ("state", "occupation", "land_area"):
-            if (not has_field(f)) or (best_conf(f) < 0.75):
-                llm_needed.append(f)
+        # Best confidence per field in one pass over the clauses; clauses whose
+        # confidence isn't numeric still don't count, as before.
+        field_conf: Dict[str, float] = {}
+        for c in chain(structured['required'], structured['optional']):
+            if not isinstance(c, dict):
+                continue
+            try:
+                conf = float(c.get('confidence', 0.0))
+            except Exception:
+                continue
+            f = str(c.get('field')).lower()
+            field_conf[f] = max(field_conf[f], conf) if f in field_conf else conf
+        llm_needed = [f for f in ("state", "occupation", "land_area") if field_conf.get(f, 0.0) < 0.75]
         if not llm_needed:
             return structured
         llm_json = self._call_llm_fallback(elig_text)
@@ -246,7 +436,9 @@ class EligibilityExtractor:
                     structured["required"].append(use_clause)
             self._cache_llm_result(scheme_id, validated)
         # Gender fallback if missing or low-confidence
-        if (not has_field("gender")) or (best_conf("gender") < 0.75):
+        # LLM clauses appended above are only state/occupation/land_area, so the
+        # gender confidence from the initial pass still holds
+        if field_conf.get("gender", 0.0) < 0.75:
             g_resp = self._call_llm_gender(elig_text)
             g_val = self._validate_and_canonicalize_gender_llm(g_resp or {})
             if g_val.get("gender") is not None and float(g_val.get("confidence", 0.0)) >= 0.75:
@@ -260,15 +452,24 @@ class EligibilityExtractor:
                 })
         return structured
 
-    def _call_llm_fallback(self, text: str) -> Optional[Dict[str, Any]]:
-        try:
-            import os
-            import google.generativeai as genai
+    def _get_genai_model(self):
+        """Return the shared Gemini model, or None when no API key is set."""
+        if self._genai_model is None:
             api_key = os.getenv("GOOGLE_API_KEY")
             if not api_key:
                 return None
-            genai.configure(api_key=api_key)
-            model = genai.GenerativeModel("gemini-1.5-flash")
+            with self._genai_lock:
+                if self._genai_model is None:
+                    import google.generativeai as genai
+                    genai.configure(api_key=api_key)
+                    self._genai_model = genai.GenerativeModel("gemini-1.5-flash")
+        return self._genai_model
+
+    def _call_llm_fallback(self, text: str) -> Optional[Dict[str, Any]]:
+        try:
+            model = self._get_genai_model()
+            if model is None:
+                return None
             prompt = (
                 "Extract structured eligibility clauses from this snippet. Return JSON with keys: required (list of {field, operator, value, text_span}), optional (same). "
                 "Only include fields: state, occupation, land_area. Use canonical state names and land_area in hectares. If range, operator='between' and value=[min,max]. If none, omit.\nSnippet:\n" + text
@@ -327,23 +528,24 @@ class EligibilityExtractor:
         return out or None
 
     def _cache_llm_result(self, scheme_id: str, data: Dict[str, Any]) -> None:
+        # Append-only JSON lines: one record per call instead of rewriting the
+        # whole cache each time. When reading it back, the last line per id wins.
         try:
-            self._llm_cache[scheme_id] = data
-            cache_path = Path("llm_cache.json")
-            Path(cache_path.parent).mkdir(parents=True, exist_ok=True)
-            with open(cache_path, "w", encoding="utf-8") as f:
-                json.dump(self._llm_cache, f)
+            line = orjson.dumps({"id": scheme_id, "data": data}) + b"\n"
+            with self._llm_cache_lock:
+                self._llm_cache[scheme_id] = data
+                cache_path = Path("llm_cache.jsonl")
+                Path(cache_path.parent).mkdir(parents=True, exist_ok=True)
+                with open(cache_path, "ab") as f:
+                    f.write(line)
         except Exception:
             pass
 
     def _call_llm_gender(self, text: str) -> Optional[Dict[str, Any]]:
         try:
-            import os
-            import google.generativeai as genai
-            api_key = os.getenv("GOOGLE_API_KEY")
-            if not api_key:
+            model = self._get_genai_model()
+            if model is None:
                 return None
-            genai.configure(api_key=api_key)
             system_prompt = (
                 "You are a high-precision extractor that converts human-written eligibility text into structured rules.\n"
                 "Return ONLY a JSON object (no explanation) that contains any gender-related eligibility you can confidently infer.\n\n"
@@ -360,7 +562,6 @@ class EligibilityExtractor:
                 "- Output must be valid JSON with the exact keys: `gender`, `evidence`, `confidence`, `source`."
             )
             user_prompt = f"Here is the eligibility text to parse:\n\n{text}\n\nReturn the JSON object now."
-            model = genai.GenerativeModel("gemini-1.5-flash")
             resp = model.generate_content([
                 {"role": "system", "parts": [system_prompt]},
                 {"role": "user", "parts": [user_prompt]},
@@ -399,13 +600,13 @@ class EligibilityExtractor:
 
         try:
             text = elig_text
-            clauses = re.split(r'(?<=[.!?])\s+', text)
+            clauses = SENTENCE_SPLIT_RE.split(text)
             for clause in clauses:
                 clause = clause.strip()
                 if not clause:
                     continue
                 rule = self._parse_rule(clause)
-                if any(word in clause.lower() for word in ["must", "require", "shall", "need to"]):
+                if REQUIRED_KW_RE.search(clause):
                     out["required"].append(rule)
                 else:
                     out["optional"].append(rule)
@@ -558,28 +759,7 @@ class EligibilityExtractor:
 
             return out
 
-    def canonicalize_occupation(self, occ: str) -> str:
-        key = occ.strip().lower()
-        mapping = {
-            "farmer": "Farmer",
-            "fish farmer": "Farmer",
-            "agriculturist": "Farmer",
-            "horticulture farmer": "Farmer",
-            "weaver": "Weaver",
-            "worker": "Worker",
-            "construction worker": "Worker",
-            "agricultural labourer": "Worker",
-            "landless labourer": "Worker",
-            "student": "Student",
-            "candidate": "Candidate",
-            "beneficiary": "Beneficiary",
-            "entrepreneur": "Entrepreneur",
-            "trader": "Trader",
-            "artisan": "Artisan",
-            "bride": "Bride",
-            "applicant": "Applicant",
-        }
-        return mapping.get(key, occ.strip().title())
+    canonicalize_occupation = staticmethod(canonicalize_occupation)
 
     def ensure_land_area_hectares(self, rule: Dict[str, Any]) -> Dict[str, Any]:
         v = rule.get("value")
@@ -608,15 +788,8 @@ class EligibilityExtractor:
         }
         
         # Simple pattern matching
-        patterns = [
-            (r'(\w+)\s+(must|should)\s+be\s+([\w\s]+)', 1, '==', 3),
-            (r'(\w+)\s+(must|should)\s+have\s+([\w\s]+)', 1, 'has', 3),
-            (r'(\w+)\s+(?:must|should)\s+be\s+at\s+least\s+([\d,]+)', 1, '>=', 2),
-            (r'(\w+)\s+(?:must|should)\s+be\s+at\s+most\s+([\d,]+)', 1, '<=', 2),
-        ]
-        
-        for pattern, field_idx, op, value_idx in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern, field_idx, op, value_idx in PARSE_RULE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 rule.update({
                     "field": match.group(field_idx).strip().lower(),
@@ -628,20 +801,119 @@ class EligibilityExtractor:
                 
         return rule
 
+    def extract_and_save_streaming(self) -> bool:
+        """Extract rules and write the output one row group at a time.
+
+        Replaces load_data / extract_rules / save_results for inputs too large
+        to hold in memory: only the current batch is ever converted to pandas.
+        """
+        try:
+            limit = self.config.get('limit')
+            source = pq.ParquetFile(self.config['input_file'])
+            total_schemes = source.metadata.num_rows
+            work_rows = min(total_schemes, limit) if isinstance(limit, int) and limit > 0 else total_schemes
+            logger.info(f"Starting streaming rule extraction for {work_rows} of {total_schemes} schemes...")
+            nproc = self.config.get('workers') or os.cpu_count() or 1
+            with ExitStack() as stack:
+                executor = None
+                if nproc > 1 and work_rows >= PARALLEL_MIN_ROWS:
+                    logger.info(f"Processing {work_rows} schemes across {nproc} worker processes")
+                    executor = stack.enter_context(ProcessPoolExecutor(
+                        max_workers=nproc, initializer=_init_worker, initargs=(self.config,)))
+
+                def structure_batch(batch: pa.RecordBatch, existing: pa.Array, offset: int) -> pa.Array:
+                    n = max(0, min(batch.num_rows, work_rows - offset))
+                    if n == 0:
+                        return existing
+                    inputs = batch.slice(0, n).select([c for c in RULE_INPUT_COLUMNS if c in batch.schema.names])
+                    records = self._records(inputs.to_pandas())
+                    outcomes = self._apply_llm_passes(records, self._structure_records(records, executor))
+                    self.processed_count += sum(ok for _, ok in outcomes)
+                    structured = pa.array([orjson.dumps(rules).decode() for rules, _ in outcomes], type=pa.large_string())
+                    # Rows past `limit` keep whatever they already had.
+                    return pa.concat_arrays([structured, existing.slice(n)]) if n < batch.num_rows else structured
+
+                output_path = self._write_output(source, structure_batch)
+            logger.info(f"Successfully saved {self.processed_count} processed schemes to {output_path}")
+            return True
+        except Exception as e:
+            logger.error(f"Error in streaming extraction: {e}")
+            return False
+
     def save_results(self) -> bool:
         """Save the processed data to the output file."""
         try:
-            # Ensure the directory exists
-            output_path = Path(self.config['output_file'])
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            self.df.to_parquet(str(output_path), index=False)
+            structured = pa.array(self.df['eligibility_structured'], type=pa.large_string(), from_pandas=True)
+
+            def structure_batch(batch: pa.RecordBatch, existing: pa.Array, offset: int) -> pa.Array:
+                n = max(0, min(batch.num_rows, len(structured) - offset))
+                if n == batch.num_rows:
+                    return structured.slice(offset, n)
+                # Rows past a `limit` were never loaded and keep what they had.
+                return pa.concat_arrays([structured.slice(offset, n), existing.slice(n)])
+
+            output_path = self._write_output(pq.ParquetFile(self.config['input_file']), structure_batch)
             logger.info(f"Successfully saved {self.processed_count} processed schemes to {output_path}")
             return True
         except Exception as e:
             logger.error(f"Error saving results: {e}")
             return False
 
+    def _write_output(self, source: pq.ParquetFile, structure_batch) -> Path:
+        """Copy `source` to the output file with a new eligibility_structured column.
+
+        The pass-through columns are streamed in Arrow form, a row group at a
+        time, instead of round-tripping through pandas. `structure_batch(batch,
+        existing, offset)` returns the column for each batch, where `existing`
+        is the batch's current eligibility_structured (nulls if there is none).
+        """
+        # Ensure the directory exists
+        output_path = Path(self.config['output_file'])
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        schema = source.schema_arrow
+        field = pa.field('eligibility_structured', pa.large_string())
+        if 'eligibility_structured' in schema.names:
+            position = schema.get_field_index('eligibility_structured')
+            schema = schema.set(position, field)
+        else:
+            position = None
+            schema = schema.append(field)
+        # Written beside the target and moved into place, so the output may
+        # overwrite the input it is being streamed from.
+        tmp_path = output_path.with_name(output_path.name + '.tmp')
+        offset = 0
+        # Written once, re-read by every downstream script: favour size, and
+        # keep row groups small so scheme_id filters can skip most of them.
+        with pq.ParquetWriter(str(tmp_path), schema, compression='zstd', compression_level=9) as writer:
+            for batch in source.iter_batches(batch_size=ROW_GROUP_SIZE):
+                if position is None:
+                    existing = pa.nulls(batch.num_rows, pa.large_string())
+                else:
+                    existing = batch.column(position).cast(pa.large_string())
+                column = structure_batch(batch, existing, offset)
+                offset += batch.num_rows
+                if position is None:
+                    batch = batch.append_column(field, column)
+                else:
+                    batch = batch.set_column(position, field, column)
+                writer.write_batch(batch, row_group_size=ROW_GROUP_SIZE)
+        os.replace(tmp_path, output_path)
+        return output_path
+
+_worker_extractor: Optional[EligibilityExtractor] = None
+
+
+def _init_worker(config: Dict[str, Any]) -> None:
+    """Give each worker process its own extractor built from the parent's config."""
+    global _worker_extractor
+    _worker_extractor = EligibilityExtractor(config)
+
+
+def _worker_structure(row: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+    return _worker_extractor._structure_scheme(row)
+
+
 def main():
     import argparse
     parser = argparse.ArgumentParser()
@@ -649,6 +921,12 @@ def main():
     parser.add_argument("--output", dest="output_file", default="schemes_with_rules.parquet")
     parser.add_argument("--llm-fallback", dest="llm_fallback", action="store_true")
     parser.add_argument("--limit", dest="limit", type=int, default=None)
+    parser.add_argument("--workers", dest="workers", type=int, default=None,
+                        help="Worker processes for rule extraction (default: all cores)")
+    parser.add_argument("--llm-concurrency", dest="llm_concurrency", type=int, default=LLM_CONCURRENCY,
+                        help="Concurrent LLM fallback requests")
+    parser.add_argument("--stream", dest="stream", action="store_true",
+                        help="Extract and write one row group at a time to bound memory use")
     args = parser.parse_args()
 
     extractor = EligibilityExtractor({
@@ -658,9 +936,14 @@ def main():
         'max_retries': 3,
         'delay_between_requests': 1.0,
         'llm_fallback': bool(args.llm_fallback),
-        'limit': args.limit
+        'limit': args.limit,
+        'workers': args.workers,
+        'llm_concurrency': args.llm_concurrency
     })
 
+    if args.stream:
+        extractor.extract_and_save_streaming()
+        return
     if not extractor.load_data():
         return
     if not extractor.extract_rules():
@@ -17,8 +17,21 @@ def test_gemini():
         # 3. Configure the API
         genai.configure(api_key=api_key)
         
-        # 4. List available models
-        print("🔍 Listing available models...")
+        # 4. Try the configured model directly; listing models costs an extra
+        # round trip, so it only happens if this fails.
+        test_model = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+        print(f"🔄 Testing with model: {test_model}")
+        try:
+            model = genai.GenerativeModel(test_model)
+            response = model.generate_content("Say hello and tell me what model you are")
+            print("\n✅ Success!")
+            print("Response:", response.text)
+            return True
+        except Exception as direct_error:
+            print(f"\n❌ Error with model {test_model}: {str(direct_error)}")
+
+        # 5. List available models
+        print("\n🔍 Listing available models...")
         models = genai.list_models()
         
         if not models:
@@ -32,7 +45,7 @@ def test_gemini():
             model_names.append(model_name)
             print(f"- {model_name}")
         
-        # 5. Try with a model that supports text generation
+        # 6. Try with a model that supports text generation
         text_models = [m for m in model_names if 'gemini' in m.lower() and 'embedding' not in m.lower()]
         
         if not text_models:
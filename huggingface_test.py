@@ -3,6 +3,9 @@ import os
 import requests
 from dotenv import load_dotenv
 
+# Shared so repeated probes reuse pooled keep-alive connections per host.
+_SESSION = requests.Session()
+
 def test_huggingface():
     # 1. Load environment variables
     load_dotenv(override=True)
@@ -18,19 +21,21 @@ def test_huggingface():
         print("🔄 Testing Hugging Face API...")
         
         # Try with the new endpoint first
-        response = requests.post(
+        response = _SESSION.post(
             API_URL,
             headers=headers,
-            json={"inputs": "Hello, I'm a language model,", "parameters": {"max_new_tokens": 50}}
+            json={"inputs": "Hello, I'm a language model,", "parameters": {"max_new_tokens": 50}},
+            timeout=30
         )
         
         # If that fails, try the inference API with a different model
         if response.status_code != 200:
             print("Trying alternative model...")
-            response = requests.post(
+            response = _SESSION.post(
                 "https://api-inference.huggingface.co/models/EleutherAI/gpt-neo-125m",
                 headers=headers,
-                json={"inputs": "Hello, I'm a language model,"}
+                json={"inputs": "Hello, I'm a language model,"},
+                timeout=30
             )
         
         if response.status_code == 200:
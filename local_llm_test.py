@@ -1,12 +1,15 @@
 # local_llm_test.py
-from transformers import pipeline
 from dotenv import load_dotenv
-import torch
 
 def test_local_llm():
     print("🚀 Setting up local language model...")
     
     try:
+        # Imported here: torch and transformers take seconds to import, and a
+        # missing install is reported with the troubleshooting steps below.
+        import torch
+        from transformers import pipeline
+
         # Use a small, fast model for testing
         model_name = "distilgpt2"  # Small version of GPT-2 that runs locally
         
@@ -72,21 +72,37 @@ INPUT_KEY_ALIASES: Dict[str, str] = {
 COMMONLY_REQUIRED_FIELDS = ["state", "age", "income_annual", "category", "occupation"]
 
 
+# canonical key -> every raw key spelling _extract_raw_value accepts, in lookup
+# order: each alias (then the canonical key itself) as given, UPPER and Title case.
+_CANONICAL_INPUT_KEYS: Dict[str, Tuple[str, ...]] = {}
+for _canonical in dict.fromkeys(INPUT_KEY_ALIASES.values()):
+    _keys = [k for k, v in INPUT_KEY_ALIASES.items() if v == _canonical] + [_canonical]
+    _CANONICAL_INPUT_KEYS[_canonical] = tuple(dict.fromkeys(
+        variant for key in _keys for variant in (key, key.lower(), key.upper(), key.title())
+    ))
+del _canonical, _keys
+
+
 def _extract_raw_value(raw_profile: Dict[str, Any], canonical_key: str) -> Optional[Any]:
     """
     Try multiple alias keys in raw_profile to get the value for canonical_key.
     """
-    candidates = [k for k, v in INPUT_KEY_ALIASES.items() if v == canonical_key]
-    # Also allow exact canonical key
-    candidates.append(canonical_key)
-
-    for key in candidates:
-        for variant in {key, key.lower(), key.upper(), key.title()}:
-            if variant in raw_profile:
-                return raw_profile.get(variant)
+    keys = _CANONICAL_INPUT_KEYS.get(canonical_key)
+    if keys is None:
+        keys = tuple(dict.fromkeys((canonical_key, canonical_key.lower(), canonical_key.upper(), canonical_key.title())))
+    for key in keys:
+        if key in raw_profile:
+            return raw_profile[key]
     return None
 
 
+def _clean_str(value: Any) -> Optional[str]:
+    """Stripped string form of a free-text field; None and "" mean not given."""
+    if value is None or value == "":
+        return None
+    return value.strip() if isinstance(value, str) else str(value).strip()
+
+
 def normalize_profile(raw_profile: Dict[str, Any]) -> Tuple[UserProfile, Dict[str, Any]]:
     """
     Normalize a raw user profile dict into a UserProfile and diagnostics.
@@ -145,7 +161,7 @@ def normalize_profile(raw_profile: Dict[str, Any]) -> Tuple[UserProfile, Dict[st
 
     # occupation
     raw_occupation = _extract_raw_value(raw_profile, "occupation")
-    occupation = str(raw_occupation).strip() if raw_occupation not in (None, "") else None
+    occupation = _clean_str(raw_occupation)
 
     # education
     raw_education = _extract_raw_value(raw_profile, "education_level")
@@ -176,21 +192,19 @@ def normalize_profile(raw_profile: Dict[str, Any]) -> Tuple[UserProfile, Dict[st
 
     # disability
     raw_disability = _extract_raw_value(raw_profile, "disability")
-    disability = str(raw_disability).strip() if raw_disability not in (None, "") else None
+    disability = _clean_str(raw_disability)
 
     # business_type
     raw_business_type = _extract_raw_value(raw_profile, "business_type")
-    business_type = (
-        str(raw_business_type).strip() if raw_business_type not in (None, "") else None
-    )
+    business_type = _clean_str(raw_business_type)
 
     # district, pincode, user_id, documents (simple pass-through)
     user_id = raw_profile.get("user_id") or raw_profile.get("userId")
     raw_district = _extract_raw_value(raw_profile, "district")
-    district = str(raw_district).strip() if raw_district not in (None, "") else None
+    district = _clean_str(raw_district)
 
     raw_pincode = _extract_raw_value(raw_profile, "pincode")
-    pincode = str(raw_pincode).strip() if raw_pincode not in (None, "") else None
+    pincode = _clean_str(raw_pincode)
 
     documents = raw_profile.get("documents") or {}
     if not isinstance(documents, dict):
@@ -1,21 +1,58 @@
 import os
 import re
 import uuid
+from collections import Counter
+from functools import lru_cache
+from itertools import islice
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 import pdfplumber
+try:
+    import pypdfium2 as pdfium  # optional: C++ text extraction, much faster than pdfplumber
+except ImportError:
+    pdfium = None
 from bs4 import BeautifulSoup
 import chardet
 from langdetect import detect
 from googletrans import Translator
 from datetime import datetime
-from typing import Dict, Tuple, Optional
+from typing import Dict, Iterable, Tuple, Optional
 import logging
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Processed rows held in memory before each Parquet write (one row group per write).
+# The rule extractor re-batches its input by its own ROW_GROUP_SIZE, so this need not match it.
+OUTPUT_BATCH_ROWS = 4096
+
+# Missing-value markers recognised by pd.read_csv (pyarrow's defaults lack the last two)
+CSV_NULL_VALUES = pacsv.ConvertOptions().null_values + ['<NA>', 'None']
+
+# Scheme text repeats a lot of boilerplate, and detection is a pure function of it.
+_detect_cached = lru_cache(maxsize=20000)(detect)
+
 class SchemeProcessor:
+    _HTML_TAG_RE = re.compile(r'<[^>]+>')
+
+    TEXT_FIELDS = ['description_raw', 'benefits_raw', 'eligibility_raw', 'process_raw']
+
+    # Input CSV column -> output field
+    FIELD_MAPPING = {
+        'scheme_name': 'scheme_name',
+        'description': 'description_raw',
+        'benefits': 'benefits_raw',
+        'eligibility': 'eligibility_raw',
+        'process': 'process_raw',
+        'state_scope': 'state_scope',
+        'category': 'category',
+        'source_url': 'source_url',
+        'last_updated': 'last_updated'
+    }
+
     def __init__(self, csv_path: str, raw_docs_dir: str = 'raw_docs'):
         """
         Initialize the SchemeProcessor with CSV path and raw documents directory.
@@ -27,6 +64,8 @@ class SchemeProcessor:
         self.csv_path = csv_path
         self.raw_docs_dir = raw_docs_dir
         self.translator = Translator()
+        # (text, src_lang) -> English; boilerplate repeats across schemes
+        self._translations: Dict[Tuple[str, str], str] = {}
         
         # Define required output columns
         self.output_columns = [
@@ -44,31 +83,53 @@ class SchemeProcessor:
     def load_csv(self) -> pd.DataFrame:
         """Load the CSV file into a pandas DataFrame."""
         try:
-            # Try to detect encoding
+            # Try to detect encoding; UTF-8 and its subsets skip transcoding
             encoding = self.detect_file_encoding(self.csv_path)
-            df = pd.read_csv(self.csv_path, encoding=encoding, on_bad_lines='warn')
+            if not encoding or encoding.lower() in ('ascii', 'utf-8', 'utf-8-sig'):
+                encoding = 'utf8'
+            # The mapped columns are read as text so dates and numbers keep
+            # their original spelling instead of being inferred.
+            table = pacsv.read_csv(
+                self.csv_path,
+                read_options=pacsv.ReadOptions(encoding=encoding, block_size=4 << 20),
+                parse_options=pacsv.ParseOptions(newlines_in_values=True,
+                                                 invalid_row_handler=self._skip_bad_row),
+                convert_options=pacsv.ConvertOptions(
+                    column_types={col: pa.string() for col in self.FIELD_MAPPING},
+                    null_values=CSV_NULL_VALUES, strings_can_be_null=True))
+            df = table.to_pandas()
             logger.info(f"Successfully loaded CSV with {len(df)} rows")
             return df
         except Exception as e:
             logger.error(f"Error loading CSV: {str(e)}")
             raise
     
+    def _skip_bad_row(self, row) -> str:
+        logger.warning(f"Skipping malformed CSV row: expected {row.expected_columns} "
+                       f"fields, saw {row.actual_columns}: {row.text[:100]}")
+        return 'skip'
+    
     def clean_text(self, text: str) -> str:
         """Clean and normalize text."""
         if pd.isna(text):
             return ""
+        return self._clean_str(str(text))
+    
+    def clean_column(self, values: pd.Series) -> pd.Series:
+        """Apply clean_text to a whole column, checking for missing values in one pass."""
+        present = values.notna().to_numpy()
+        clean = self._clean_str
+        return pd.Series([clean(str(v)) if ok else "" for v, ok in zip(values, present)],
+                         index=values.index, dtype=object)
+    
+    def _clean_str(self, text: str) -> str:
+        # Remove HTML tags (the '<' test skips the regex for plain text)
+        if '<' in text:
+            text = self._HTML_TAG_RE.sub(' ', text)
         
-        # Convert to string if not already
-        text = str(text)
-        
-        # Remove HTML tags
-        text = re.sub(r'<[^>]+>', ' ', text)
-        
-        # Replace non-ASCII quotes and dashes
-        text = text.replace('"', '"')
-        text = text.replace('\'', "'")
-        text = text.replace('–', '-')
-        text = text.replace('—', '-')
+        # Replace non-ASCII dashes. str.replace is used rather than
+        # str.translate, whose non-ASCII mapping path is far slower.
+        text = text.replace('\u2013', '-').replace('\u2014', '-')
         
         # Normalize whitespace
         text = ' '.join(text.split())
@@ -82,7 +143,7 @@ class SchemeProcessor:
     def detect_language(self, text: str) -> str:
         """Detect the language of the text."""
         try:
-            return detect(text)
+            return _detect_cached(text)
         except:
             return 'en'  # Default to English if detection fails
     
@@ -90,9 +151,13 @@ class SchemeProcessor:
         """Translate text to English if it's not already in English."""
         if not text or src_lang == 'en':
             return text
+        cached = self._translations.get((text, src_lang))
+        if cached is not None:
+            return cached
             
         try:
             translated = self.translator.translate(text, src=src_lang, dest='en')
+            self._translations[(text, src_lang)] = translated.text
             return translated.text
         except Exception as e:
             logger.warning(f"Translation failed: {str(e)}")
@@ -100,16 +165,33 @@ class SchemeProcessor:
     
     def extract_text_from_pdf(self, file_path: str) -> str:
         """Extract text from a PDF file."""
+        if pdfium is not None:
+            try:
+                return self._extract_text_pdfium(file_path)
+            except Exception as e:
+                logger.warning(f"pdfium could not read {file_path}, falling back to pdfplumber: {str(e)}")
         try:
-            text = ""
             with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    text += page.extract_text() + "\n"
-            return text
+                return "".join(page.extract_text() + "\n" for page in pdf.pages)
         except Exception as e:
             logger.error(f"Error extracting text from PDF {file_path}: {str(e)}")
             return ""
     
+    @staticmethod
+    def _extract_text_pdfium(file_path: str) -> str:
+        """Extract text with pypdfium2; only plain text is needed, not layout."""
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            parts = []
+            for page in pdf:
+                textpage = page.get_textpage()
+                parts.append(textpage.get_text_range() + "\n")
+                textpage.close()
+                page.close()
+            return "".join(parts)
+        finally:
+            pdf.close()
+    
     def extract_text_from_html(self, file_path: str) -> str:
         """Extract text from an HTML file."""
         try:
@@ -185,30 +267,23 @@ class SchemeProcessor:
         
         return row, synthesized
     
-    def process_scheme(self, row: dict) -> dict:
-        """Process a single scheme row."""
+    def process_scheme(self, row: dict, precleaned: bool = False) -> dict:
+        """Process a single scheme row.
+        
+        With precleaned=True the mapped fields are taken as already passed
+        through clean_column (as process() does) and are not cleaned again.
+        """
         # Initialize with default values
         scheme = {
             'scheme_id': str(uuid.uuid4()),
             'synthesized_fields': []
         }
         
-        # Map input fields to output fields
-        field_mapping = {
-            'scheme_name': 'scheme_name',
-            'description': 'description_raw',
-            'benefits': 'benefits_raw',
-            'eligibility': 'eligibility_raw',
-            'process': 'process_raw',
-            'state_scope': 'state_scope',
-            'category': 'category',
-            'source_url': 'source_url',
-            'last_updated': 'last_updated'
-        }
-        
         # Map and clean fields
-        for input_field, output_field in field_mapping.items():
-            if input_field in row and pd.notna(row[input_field]):
+        for input_field, output_field in self.FIELD_MAPPING.items():
+            if precleaned:
+                scheme[output_field] = row.get(input_field, "")
+            elif input_field in row and pd.notna(row[input_field]):
                 scheme[output_field] = self.clean_text(row[input_field])
             else:
                 scheme[output_field] = ""
@@ -260,32 +335,85 @@ class SchemeProcessor:
         
         return scheme
     
+    def _process_row(self, indexed_row: Tuple[object, dict]) -> Optional[dict]:
+        """Process one (index, row) pair from process(); errors are logged and give None."""
+        idx, row = indexed_row
+        try:
+            return self.process_scheme(row, precleaned=True)
+        except Exception as e:
+            logger.error(f"Error processing row {idx}: {str(e)}")
+            return None
+    
     def validate_output(self, df: pd.DataFrame) -> bool:
         """Validate the output DataFrame meets requirements."""
+        counts = self._validation_counts(df)
+        if counts is None:
+            return False
+        self._report_validation(counts)
+        return True
+    
+    def _validation_counts(self, df: pd.DataFrame) -> Optional[Counter]:
+        """Row-level part of validate_output; counts add up across batches, None means invalid."""
         # Check required fields
         if 'scheme_id' not in df.columns or 'scheme_name' not in df.columns:
             logger.error("Missing required columns: scheme_id or scheme_name")
-            return False
+            return None
         
         # Check for null scheme_id or scheme_name
         if df['scheme_id'].isnull().any() or df['scheme_name'].isnull().any():
             logger.error("Found null values in scheme_id or scheme_name")
-            return False
+            return None
         
+        counts = Counter(rows=len(df),
+                         with_eligibility=int(df['eligibility_raw'].str.strip().astype(bool).sum()))
+        for field in self.TEXT_FIELDS:
+            if field in df.columns:
+                counts[field] = int((df[field].str.len() > 6000).sum())
+        return counts
+    
+    def _report_validation(self, counts: Counter) -> None:
         # Check at least 90% of rows have non-empty eligibility_raw
-        elig_ratio = df['eligibility_raw'].str.strip().astype(bool).mean()
-        if elig_ratio < 0.9:
-            logger.warning(f"Only {elig_ratio*100:.1f}% of rows have non-empty eligibility_raw (below 90%)")
+        if counts['rows']:
+            elig_ratio = counts['with_eligibility'] / counts['rows']
+            if elig_ratio < 0.9:
+                logger.warning(f"Only {elig_ratio*100:.1f}% of rows have non-empty eligibility_raw (below 90%)")
         
         # Check text field lengths
-        text_fields = ['description_raw', 'benefits_raw', 'eligibility_raw', 'process_raw']
-        for field in text_fields:
-            if field in df.columns:
-                too_long = df[field].str.len() > 6000
-                if too_long.any():
-                    logger.warning(f"Found {too_long.sum()} rows with {field} exceeding 6000 characters")
+        for field in self.TEXT_FIELDS:
+            if counts[field]:
+                logger.warning(f"Found {counts[field]} rows with {field} exceeding 6000 characters")
+    
+    def _write_output(self, outcomes: Iterable[Optional[dict]], output_path: str) -> bool:
+        """Validate and write processed schemes to Parquet, OUTPUT_BATCH_ROWS at a time.
         
-        return True
+        Batches go to a temporary file that replaces output_path only once
+        every batch has passed validation, so a failed run leaves no output.
+        """
+        logger.info(f"Saving to {output_path}...")
+        schema = pa.schema([(col, pa.large_string()) for col in self.output_columns])
+        schemes = (scheme for scheme in outcomes if scheme is not None)
+        totals = Counter()
+        tmp_path = output_path + '.tmp'
+        try:
+            # zstd keeps the long text columns small
+            with pq.ParquetWriter(tmp_path, schema, compression='zstd', compression_level=3) as writer:
+                while True:
+                    batch = list(islice(schemes, OUTPUT_BATCH_ROWS))
+                    if not batch:
+                        break
+                    batch_df = pd.DataFrame(batch, columns=self.output_columns)
+                    counts = self._validation_counts(batch_df)
+                    if counts is None:
+                        logger.error("Output validation failed")
+                        return False
+                    totals.update(counts)
+                    writer.write_table(pa.Table.from_pandas(batch_df, schema=schema, preserve_index=False))
+            self._report_validation(totals)
+            os.replace(tmp_path, output_path)
+            return True
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
     
     def process(self, output_path: str = 'schemes_cleaned.parquet') -> bool:
         """Process the schemes and save the output."""
@@ -298,37 +426,19 @@ class SchemeProcessor:
                 logger.error("Input CSV is empty")
                 return False
             
+            # Clean the mapped columns up front, a column at a time
+            for input_field in self.FIELD_MAPPING:
+                if input_field in df.columns:
+                    df[input_field] = self.clean_column(df[input_field])
+            
             # Process each row
             logger.info(f"Processing {len(df)} schemes...")
-            processed_schemes = []
-            for _, row in df.iterrows():
-                try:
-                    scheme = self.process_scheme(row)
-                    processed_schemes.append(scheme)
-                except Exception as e:
-                    logger.error(f"Error processing row {_}: {str(e)}")
-            
-            # Create output DataFrame
-            output_df = pd.DataFrame(processed_schemes)
-            
-            # Ensure all required columns exist
-            for col in self.output_columns:
-                if col not in output_df.columns:
-                    output_df[col] = ""
-            
-            # Reorder columns
-            output_df = output_df[self.output_columns]
-            
-            # Validate output
-            if not self.validate_output(output_df):
-                logger.error("Output validation failed")
-                return False
-            
-            # Save to parquet
-            logger.info(f"Saving to {output_path}...")
-            output_df.to_parquet(output_path, index=False)
-            logger.info("Processing completed successfully")
-            return True
+            rows = zip(df.index, df.to_dict('records'))
+            # Processed rows are written out batch by batch as they arrive
+            written = self._write_output(map(self._process_row, rows), output_path)
+            if written:
+                logger.info("Processing completed successfully")
+            return written
             
         except Exception as e:
             logger.error(f"Processing failed: {str(e)}", exc_info=True)
@@ -355,12 +465,15 @@ def main():
 
 def display_processed_data():
     try:
-        df = pd.read_parquet("schemes_cleaned.parquet")
+        # Only the first rows are shown, so only the first batch is decoded;
+        # the record count comes from the file footer.
+        pf = pq.ParquetFile("schemes_cleaned.parquet")
+        df = next(pf.iter_batches(batch_size=5), pf.schema_arrow.empty_table()).to_pandas()
         print("\nFirst few rows of the processed data:")
         print(df.head())
         print("\nData types:")
         print(df.dtypes)
-        print(f"\nTotal number of records: {len(df)}")
+        print(f"\nTotal number of records: {pf.metadata.num_rows}")
     except Exception as e:
         print(f"\nError displaying data: {str(e)}")
 
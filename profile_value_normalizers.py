@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Optional
 
+# The string normalizers below are pure functions over a small set of distinct
+# inputs (states, categories, genders, education levels), so results are cached.
+
 
 # --- State normalization ---
 
@@ -36,6 +40,7 @@ _STATE_LOOKUP = {
 }
 
 
+@lru_cache(maxsize=1024)
 def normalize_state(value: Optional[str]) -> Optional[str]:
     if value is None:
         return None
@@ -69,6 +74,7 @@ _CATEGORY_LOOKUP = {
 }
 
 
+@lru_cache(maxsize=1024)
 def normalize_category(value: Optional[str]) -> Optional[str]:
     if value is None:
         return None
@@ -106,6 +112,7 @@ _GENDER_MAP = {
 }
 
 
+@lru_cache(maxsize=1024)
 def normalize_gender(value: Optional[str]) -> Optional[str]:
     if value is None:
         return None
@@ -190,6 +197,7 @@ _EDU_MAP = {
 }
 
 
+@lru_cache(maxsize=1024)
 def normalize_education(value: Optional[str]) -> Optional[str]:
     if value is None:
         return None
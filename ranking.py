@@ -3,7 +3,7 @@ from typing import Dict, List, Optional, Tuple, Any
 import pandas as pd
 from user_profile_model import UserProfile
 import logging
-import json
+import orjson
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -32,7 +32,7 @@ def load_schemes_data() -> pd.DataFrame:
     global _schemes_df
     if _schemes_df is None:
         try:
-            _schemes_df = pd.read_parquet(SCHEMES_PATH)
+            _schemes_df = pd.read_parquet(SCHEMES_PATH, memory_map=True)
             logger.info(f"Loaded {len(_schemes_df)} schemes from {SCHEMES_PATH}")
         except Exception as e:
             logger.error(f"Failed to load schemes data: {e}")
@@ -135,6 +135,9 @@ def rank_schemes(
     
     results = []
     today = datetime.now()
+    # Dump the profile once for all candidates; None fields are dropped since
+    # the evaluator treats a missing key exactly like a None value.
+    profile_dict = profile.model_dump(exclude_none=True)
     
     # Process each candidate scheme
     for item in semantic_results:
@@ -155,10 +158,10 @@ def rank_schemes(
             try:
                 # Parse JSON string if needed
                 if isinstance(eligibility_structured, str):
-                    eligibility_structured = json.loads(eligibility_structured)
-                rule_result = evaluate_scheme_rules(eligibility_structured, profile.model_dump())
+                    eligibility_structured = orjson.loads(eligibility_structured)
+                rule_result = evaluate_scheme_rules(eligibility_structured, profile_dict)
                 R = rule_result.get('R', rule_result.get('score', 0.0))
-            except json.JSONDecodeError as e:
+            except orjson.JSONDecodeError as e:
                 logger.error(f"Failed to parse eligibility_structured JSON for scheme {scheme_id}: {e}")
                 R = 0.0
                 rule_result = {"score": 0.0, "breakdown": {"error": "Invalid rule format"}}
@@ -202,6 +205,12 @@ def rank_schemes(
     # Return top_k results
     return results[:top_k]
 
+# Gender clause values (lower-cased) -> bucket; anything else means no restriction.
+_GENDER_VALUES = {
+    **dict.fromkeys(("female", "f", "women", "woman", "mahila"), "female"),
+    **dict.fromkeys(("male", "m", "man", "men"), "male"),
+}
+
 def _extract_scheme_gender(eligibility_structured: Dict[str, Any]) -> Optional[str]:
     try:
         if not eligibility_structured:
@@ -212,12 +221,7 @@ def _extract_scheme_gender(eligibility_structured: Dict[str, Any]) -> Optional[s
                 val = clause.get("value")
                 if val is None:
                     return None
-                v = str(val).strip().lower()
-                if v in ("female", "f", "women", "woman", "mahila"):
-                    return "female"
-                if v in ("male", "m", "man", "men"):
-                    return "male"
-                return None
+                return _GENDER_VALUES.get(str(val).strip().lower())
     except Exception:
         return None
     return None
@@ -1,4 +1,5 @@
 import json
+import orjson
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple, Union
 
@@ -194,8 +195,8 @@ def evaluate_scheme_eligibility(
     raw_structured = scheme_row.get("eligibility_structured") or {}
     if isinstance(raw_structured, str):
         try:
-            structured = json.loads(raw_structured)
-        except json.JSONDecodeError:
+            structured = orjson.loads(raw_structured)
+        except orjson.JSONDecodeError:
             structured = {"required": [], "optional": [], "notes": "invalid_json"}
     elif isinstance(raw_structured, dict):
         structured = raw_structured
@@ -42,8 +42,15 @@ def _get_index():
                 "Please run build_faiss_index.py first."
             )
 
-        _index = faiss.read_index(str(index_path))
-        _scheme_ids = np.load(ids_path, allow_pickle=False)
+        # Memory-map both so start-up cost doesn't scale with index size;
+        # pages are faulted in lazily by the OS as searches touch them.
+        # IO_FLAG_MMAP alone only maps IVF inverted lists; IO_FLAG_MMAP_IFC
+        # also maps the code storage of flat, SQ and HNSW indexes.
+        _index = faiss.read_index(
+            str(index_path),
+            faiss.IO_FLAG_MMAP | faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY,
+        )
+        _scheme_ids = np.load(ids_path, allow_pickle=False, mmap_mode="r")
     
     return _index, _scheme_ids
 
@@ -0,0 +1,105 @@
+import json
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+import extract_eligibility_rules
+from extract_eligibility_rules import EligibilityExtractor
+
+ELIGIBILITY = [
+    "The applicant must be a resident of Rajasthan and a farmer.",
+    "The farmer must have at least 0.5 hectares of irrigated land.",
+    None,
+    "",
+    "Applicant should be a native of Kerala.",
+    "The applicant must be a resident of Rajasthan and a farmer.",
+    "Open to all citizens.",
+    "The farmer must have at least 2 hectares of land.",
+    "Applicant must be a resident of Gujarat.",
+    None,
+]
+
+
+def write_input(path, existing=False):
+    n = len(ELIGIBILITY)
+    df = pd.DataFrame({
+        "scheme_id": [f"s{i}" for i in range(n)],
+        "scheme_name": [f"Scheme {i}" for i in range(n)],
+        "eligibility_raw": ELIGIBILITY,
+        "description_raw": ["Support for farmers." if i % 3 == 0 else None for i in range(n)],
+    })
+    if existing:
+        df["eligibility_structured"] = [f"old-{i}" for i in range(n)]
+    df.to_parquet(path, index=False)
+
+
+def run(input_file, output_file, stream, limit=None):
+    extractor = EligibilityExtractor({
+        "input_file": str(input_file),
+        "output_file": str(output_file),
+        "batch_size": 3,
+        "llm_fallback": False,
+        "limit": limit,
+        "workers": 1,
+    })
+    if stream:
+        assert extractor.extract_and_save_streaming()
+    else:
+        assert extractor.load_data()
+        assert extractor.extract_rules()
+        assert extractor.save_results()
+    return pq.read_table(output_file)
+
+
+@pytest.fixture(autouse=True)
+def small_row_groups(monkeypatch):
+    # Several batches per file, so offsets and a mid-batch limit are exercised.
+    monkeypatch.setattr(extract_eligibility_rules, "ROW_GROUP_SIZE", 4)
+
+
+@pytest.mark.parametrize("existing", [False, True])
+def test_batch_and_stream_outputs_match(tmp_path, existing):
+    src = tmp_path / "in.parquet"
+    write_input(src, existing)
+    batch = run(src, tmp_path / "batch.parquet", stream=False)
+    streamed = run(src, tmp_path / "stream.parquet", stream=True)
+    assert batch.equals(streamed)
+    assert batch.column_names[:4] == ["scheme_id", "scheme_name", "eligibility_raw", "description_raw"]
+    first = json.loads(batch.column("eligibility_structured")[0].as_py())
+    assert any(c.get("field") == "state" for c in first["required"])
+
+
+@pytest.mark.parametrize("existing", [False, True])
+def test_limit_keeps_existing_values_past_limit(tmp_path, existing):
+    src = tmp_path / "in.parquet"
+    write_input(src, existing)
+    full = run(src, tmp_path / "full.parquet", stream=False).column("eligibility_structured").to_pylist()
+    limit = 6
+    batch = run(src, tmp_path / "batch.parquet", stream=False, limit=limit)
+    streamed = run(src, tmp_path / "stream.parquet", stream=True, limit=limit)
+    assert batch.equals(streamed)
+    structured = batch.column("eligibility_structured").to_pylist()
+    assert structured[:limit] == full[:limit]
+    past = [f"old-{i}" for i in range(limit, len(ELIGIBILITY))] if existing else [None] * (len(ELIGIBILITY) - limit)
+    assert structured[limit:] == past
+    assert batch.column("scheme_name").to_pylist() == [f"Scheme {i}" for i in range(len(ELIGIBILITY))]
+
+
+def test_output_may_overwrite_input(tmp_path):
+    src = tmp_path / "in.parquet"
+    write_input(src, existing=True)
+    expected = run(src, tmp_path / "expected.parquet", stream=True, limit=5)
+    assert run(src, src, stream=True, limit=5).equals(expected)
+
+
+def test_rule_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(extract_eligibility_rules, "RULE_CACHE_SIZE", 2)
+    extractor = EligibilityExtractor()
+    rows = [{"eligibility_raw": text, "description_raw": ""} for text in ELIGIBILITY if text]
+    for row in rows:
+        extractor._extract_rules_for_scheme(row)
+    assert len(extractor._rule_cache) == 2
+    # Cached results are still fresh copies.
+    again = extractor._extract_rules_for_scheme(dict(rows[-1]))
+    again["required"].clear()
+    assert extractor._extract_rules_for_scheme(dict(rows[-1]))["required"]
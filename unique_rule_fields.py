@@ -1,4 +1,4 @@
-import json
+import orjson
 import pandas as pd
 
 
@@ -8,19 +8,18 @@ def main():
     input_path = "output/processed_schemes.parquet"
     output_path = "unique_rule_fields.txt"
 
-    df = pd.read_parquet(input_path)
+    df = pd.read_parquet(input_path, columns=["eligibility_structured"])
 
     unique_fields = set()
 
-    for _, row in df.iterrows():
-        raw = row.get("eligibility_structured")
+    for (raw,) in df.itertuples(index=False, name=None):
         if raw is None:
             continue
 
         if isinstance(raw, str):
             try:
-                data = json.loads(raw)
-            except json.JSONDecodeError:
+                data = orjson.loads(raw)
+            except orjson.JSONDecodeError:
                 continue
         elif isinstance(raw, dict):
             data = raw